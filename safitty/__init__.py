@@ -1,25 +1,42 @@
-from .core import get, set
-from .types import Storage, Key, Transform
-from .parser import argparser, load, save, \
+from .core import get, set, set_many, find
+from .accessor import Accessor, PathTrie, get_many
+from .cache import ParseCache
+from .types import Storage, Key, Transform, star, dstar
+from .parser import argparser, load, load_many, save, \
     update, update_from_args, load_from_args, \
     is_path_readable, is_file_supported
 
+from .aio import aload, aload_many, aload_from_args
 from .dict import Safict
+from .shared import SharedConfig
 
 
 __all__ = [
     "Safict",
+    "Accessor",
+    "PathTrie",
+    "ParseCache",
+    "SharedConfig",
     "get",
     "set",
+    "get_many",
+    "set_many",
+    "find",
+    "star",
+    "dstar",
     "Storage",
     "Key",
     "Transform",
     "argparser",
     "load",
+    "load_many",
     "save",
     "update",
     "update_from_args",
     "load_from_args",
+    "aload",
+    "aload_many",
+    "aload_from_args",
     "is_path_readable",
     "is_file_supported"
 ]
@@ -0,0 +1,274 @@
+from copy import deepcopy
+from typing import Optional, Any, List, Tuple, Iterable, Union
+
+from safitty import core
+from safitty.core import DICT_TYPES, PLAIN_KEY_TYPES
+from safitty.types import Storage, Status, Transform, Key, Keys, Walker, Relative, MISSING
+
+
+class Accessor:
+    """Key path compiled once for many ``get`` calls.
+    Works as ``safitty.get`` with the same parameters, but the keys are normalized,
+    the walker of the strategy and the transformation are selected once at creation, not on every call.
+    Args:
+        *keys (Key):  Keys for the storage, param list of int or str
+        strategy (str): the same as ``strategy`` of ``safitty.get``
+        default (Any):  Default value used for :strategy: param
+        transform (Transform): Either type or a function applied to the result value
+        apply (Transform): As ``transform`` but unpacks the result
+        raise_on_transforms (bool): if set as True raise an Exception after fail on ``transforms`` or ``apply``
+        copy (bool): if true returns the copy of a value
+        one_of (List[Any]): check is the value one of the values
+    Examples:
+        >>> learning_rate = Accessor("optimizer", "params", "lr", default=1e-3, transform=float)
+        >>> learning_rate(config)
+        0.001
+    """
+    def __init__(
+            self,
+            *keys: Key,
+            strategy: str = None,
+            default: Optional[Any] = None,
+            transform: Optional[Transform] = None,
+            apply: Optional[Transform] = None,
+            raise_on_transforms: bool = False,
+            copy: bool = False,
+            one_of: List[Any] = None,
+    ):
+        self._walker: Walker = core.get_walker(strategy)
+
+        self.keys: Tuple[Key, ...] = tuple(core.reformat_keys(keys))
+        self.strategy = strategy
+        self.default = default
+        self.raise_on_transforms = raise_on_transforms
+        self.copy = copy
+        self.one_of = one_of
+
+        self._function: Optional[Transform] = core.resolve_function(transform, apply)
+
+    def __call__(self, storage: Optional[Storage]) -> Optional[Any]:
+        value = self._walker(storage, self.keys, self.default)
+        return self.finish(value)
+
+    def is_plain(self) -> bool:
+        """
+        Checks that the accessor returns the found value as is
+        """
+        return self._function is None and not self.copy and self.one_of is None
+
+    def finish(self, value: Optional[Any]) -> Optional[Any]:
+        """
+        Applies the transformation, ``copy`` and ``one_of`` to the found value
+        """
+        value = core.apply_function(value, self._function, self.raise_on_transforms)
+
+        if self.copy:
+            value = deepcopy(value)
+
+        if self.one_of is not None:
+            value = value in self.one_of
+
+        return value
+
+    def __repr__(self) -> str:
+        keys = ", ".join(repr(key) for key in self.keys)
+        return f"Accessor({keys}, strategy={self.strategy!r})"
+
+
+class PathTrie:
+    """Many key paths compiled into a trie for ``get_many``.
+    A common prefix of several paths is walked only once, and the trie can be applied to many storages
+    Args:
+        paths (Iterable[Union[Keys, Accessor]]): key paths. A path is either a tuple/list of keys
+            or an ``Accessor`` with its own ``get`` parameters
+        **get_params: parameters of ``safitty.get`` for the paths which are not an ``Accessor``
+    """
+    def __init__(self, paths: Iterable[Union[Keys, Accessor]], **get_params):
+        # one accessor without keys keeps the common parameters
+        common = Accessor(**get_params)
+        common_only_value = common.strategy is None and common.is_plain()
+        self._accessors: List[Accessor] = []
+
+        # paths with the default strategy and without transformations need only the value
+        self._only_value: List[bool] = []
+
+        # paths with unhashable or relative keys can't be put into the trie
+        self._detached: List[Tuple[int, Keys]] = []
+
+        # node is [key, children, indices of the paths that end in it],
+        # children are keyed by the type too, as 1 == True == 1.0 but they are different keys.
+        # Strings are never equal to keys of other types, so they are kept as is
+        root: list = [None, {}, []]
+        for i, path in enumerate(paths):
+            if isinstance(path, Accessor):
+                keys = path.keys
+                self._accessors.append(path)
+                self._only_value.append(path.strategy is None and path.is_plain())
+            else:
+                keys = path
+                self._accessors.append(common)
+                self._only_value.append(common_only_value)
+
+            node = root
+            try:
+                for key in keys:
+                    if type(key) is str:
+                        trie_key = key
+                    elif isinstance(key, Relative):
+                        break
+                    else:
+                        trie_key = type(key), key
+
+                    children = node[1]
+                    node = children.get(trie_key)
+                    if node is None:
+                        node = children[trie_key] = [key, {}, []]
+                else:
+                    node[2].append(i)
+                    continue
+            except TypeError:
+                pass
+            self._detached.append((i, keys if isinstance(path, Accessor) else core.reformat_keys(keys)))
+
+        self._root: list = root
+
+    def __len__(self) -> int:
+        return len(self._accessors)
+
+    def _finish(self, i: int, status: int, value: Any, last_value: Any, last_container: Any) -> Any:
+        accessor = self._accessors[i]
+        result = core.select_value(
+            accessor.strategy, accessor.default,
+            status, value, last_value, last_container
+        )
+        return accessor.finish(result)
+
+    def __call__(self, storage: Optional[Storage]) -> List[Optional[Any]]:
+        accessors, only_value = self._accessors, self._only_value
+        results: List[Optional[Any]] = [None] * len(accessors)
+
+        for i, keys in self._detached:
+            accessor = accessors[i]
+            results[i] = accessor.finish(accessor._walker(storage, keys, accessor.default))
+
+        stack = [(self._root, Status.OKAY, storage, storage, storage)]
+        while stack:
+            (_, children, ends), status, value, last_value, last_container = stack.pop()
+
+            for i in ends:
+                if only_value[i]:
+                    results[i] = accessors[i].default if value is None else value
+                else:
+                    results[i] = self._finish(i, status, value, last_value, last_container)
+
+            if status != Status.OKAY:
+                for child in children.values():
+                    stack.append((child, status, value, last_value, last_container))
+                continue
+
+            is_dict = type(value) in DICT_TYPES
+            for child in children.values():
+                key = child[0]
+                if is_dict and type(key) in PLAIN_KEY_TYPES:
+                    child_value = value.get(key, MISSING)
+                    if child_value is MISSING:
+                        stack.append((child, Status.MISSING_KEY, None, last_value, last_container))
+                        continue
+                    child_status = Status.OKAY
+                else:
+                    child_status, child_value = core.get_child(value, key)
+
+                # a leaf of one path which needs only the value isn't put on the stack
+                ends = child[2]
+                if not child[1] and len(ends) == 1 and only_value[ends[0]]:
+                    results[ends[0]] = accessors[ends[0]].default if child_value is None else child_value
+                    continue
+
+                if child_value is None:
+                    stack.append((child, child_status, None, last_value, last_container))
+                elif core.is_container(child_value):
+                    stack.append((child, child_status, child_value, child_value, child_value))
+                else:
+                    stack.append((child, child_status, child_value, child_value, last_container))
+
+        return results
+
+
+def walk_paths(storage: Optional[Storage], paths: Iterable[Union[Keys, Accessor]], default: Any) -> List[Any]:
+    """Walker of many key paths for the default strategy. The trie of the paths is built while the storage
+        is walked, a node keeps the value of its prefix, so every prefix is looked up once
+    Args:
+        storage (Storage): The container for `get`
+        paths (Iterable[Union[Keys, Accessor]]): key paths
+        default (Any): Default value for the paths which are not an ``Accessor``
+    Returns:
+        List[Any]: values in the order of ``paths``
+    """
+    # node is [value, children], children are None if the walk stops at the node
+    root: list = [storage, {}]
+    results: List[Any] = []
+    for path in paths:
+        if isinstance(path, Accessor):
+            results.append(path(storage))
+            continue
+
+        node = root
+        try:
+            for key in path:
+                children = node[1]
+                if children is None:
+                    break
+
+                if type(key) is str:
+                    trie_key = key
+                elif isinstance(key, Relative):
+                    node = None
+                    break
+                else:
+                    trie_key = type(key), key
+
+                child = children.get(trie_key)
+                if child is None:
+                    value = node[0]
+                    if type(value) in DICT_TYPES and type(key) in PLAIN_KEY_TYPES:
+                        value = value.get(key)
+                        child = [value, None if value is None else {}]
+                    else:
+                        status, value = core.get_child(value, key)
+                        child = [value, {} if status == Status.OKAY and value is not None else None]
+                    children[trie_key] = child
+                node = child
+        except TypeError:
+            node = None
+
+        if node is None:
+            # relative and unhashable keys
+            results.append(core.walk_value(storage, core.reformat_keys(path), default))
+        else:
+            results.append(default if node[0] is None else node[0])
+
+    return results
+
+
+def get_many(
+        storage: Optional[Storage],
+        paths: Iterable[Union[Keys, Accessor]],
+        **get_params
+) -> List[Optional[Any]]:
+    """Getter for many key paths at once. Paths are put into a trie,
+        so a common prefix of several paths is walked only once
+    Args:
+        storage (Storage): The container for `get`
+        paths (Iterable[Union[Keys, Accessor]]): key paths. A path is either a tuple/list of keys
+            or an ``Accessor`` with its own ``get`` parameters
+        **get_params: parameters of ``safitty.get`` for the paths which are not an ``Accessor``
+    Returns:
+        List[Any]: values in the order of ``paths``
+    Examples:
+        >>> get_many(config, [("stages", "train", "lr"), Accessor("stages", "train", "epochs", default=10)])
+        [0.001, 10]
+    """
+    default = get_params.pop("default", None)
+    if get_params:
+        return PathTrie(paths, default=default, **get_params)(storage)
+    return walk_paths(storage, paths, default)
@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Union, Any, Callable
+
+from .cache import ParseCache
+from .parser import argparser, load, update, update_from_args
+from .types import Storage
+
+
+async def run_in_executor(executor: Optional[Executor], function: Callable[[], Any]) -> Any:
+    """
+    Runs the function in the executor, by default in the thread pool of the event loop
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, function)
+
+
+async def aload(path: Union[str, Path], executor: Optional[Executor] = None, **load_params) -> Storage:
+    """Loads config without blocking the event loop: the file is read and parsed in a thread pool
+    Args:
+        path (Union[str, Path]): path to config file (YAML, JSON or safitty binary)
+        executor (Executor, optional): executor to use instead of the default thread pool of the loop
+        **load_params: parameters of ``safitty.load``
+    Returns:
+        (Storage): config dict
+    Examples:
+        >>> config = await safitty.aload("./config.yml", cache=cache)
+    """
+    return await run_in_executor(executor, partial(load, path, **load_params))
+
+
+async def aload_many(
+        paths: List[Union[str, Path]],
+        executor: Optional[Executor] = None,
+        **load_params
+) -> List[Storage]:
+    """Loads configs concurrently, see ``aload``
+    Args:
+        paths (List[Union[str, Path]]): paths to config files
+        executor (Executor, optional): executor to use instead of the default thread pool of the loop
+        **load_params: parameters of ``safitty.load``
+    Returns:
+        List[Storage]: configs in the order of ``paths``
+    """
+    return list(await asyncio.gather(*[aload(path, executor=executor, **load_params) for path in paths]))
+
+
+async def aload_from_args(
+        *,
+        parser: Optional[argparse.ArgumentParser] = None,
+        arguments: Optional[List[str]] = None,
+        ordered: bool = False,
+        cache: Optional[ParseCache] = None,
+        executor: Optional[Executor] = None
+) -> (argparse.Namespace, Storage):
+    """Coroutine version of ``safitty.load_from_args``. The configs are loaded concurrently,
+        loading and merging run in a thread pool
+    Args:
+        parser (ArgumentParser, optional): an argument parser
+            if none uses ``safitty.argparser()`` by default
+        arguments (List[str], optional): arguments to parse, if None uses command line arguments
+        ordered (bool): if True loads the config as an ``OrderedDict``
+        cache (ParseCache, optional): cache of parsed configs, see ``safitty.ParseCache``
+        executor (Executor, optional): executor to use instead of the default thread pool of the loop
+    Returns:
+        (Namespace, Storage): arguments from args and a
+            config dict with updated values from unknown args
+    """
+    parser = parser or argparser()
+
+    args, uargs = parser.parse_known_args(args=arguments)
+    has_config = hasattr(args, "config")
+    paths = [args.config] if has_config else []
+    if hasattr(args, "configs"):
+        paths.extend(args.configs)
+
+    configs = await aload_many(paths, executor=executor, ordered=ordered, cache=cache)
+
+    def merge() -> Storage:
+        config = configs.pop(0) if has_config else {}
+        config = update(config, *configs)
+        return update_from_args(config, uargs)
+
+    config = await run_in_executor(executor, merge)
+    return args, config
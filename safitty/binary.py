@@ -0,0 +1,307 @@
+"""
+Compact self-describing binary format of configs (``.sfb``).
+
+Every value starts with a one-byte tag. Small non-negative ints and short strings
+are stored in the tag itself, other values are followed by a big-endian length or payload:
+
+==============  =================================================
+tag             value
+==============  =================================================
+``0x00``        None
+``0x01/0x02``   False/True
+``0x03``        int, 8 bytes
+``0x04``        int of any size: length (4 bytes) + signed bytes
+``0x05``        float, 8 bytes
+``0x06``        str: length (4 bytes) + UTF-8
+``0x07``        bytes: length (4 bytes) + bytes
+``0x08-0x0d``   list, tuple, dict, OrderedDict, set, frozenset:
+                number of items (4 bytes) + items, dicts store keys and values one by one
+``0x28-0x2d``   the same containers with the size of the items in bytes (4 bytes) after the number of items,
+                so a reader can skip them without decoding
+``0x40-0x7f``   str of 0-63 UTF-8 bytes
+``0x80-0xff``   int from 0 to 127
+==============  =================================================
+
+Unlike pickle the format can't construct arbitrary objects, so it's safe to load a file from another service
+"""
+import struct
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+MAGIC = b"SFB\x01"
+
+NONE = 0x00
+FALSE = 0x01
+TRUE = 0x02
+INT = 0x03
+BIG_INT = 0x04
+FLOAT = 0x05
+STR = 0x06
+BYTES = 0x07
+LIST = 0x08
+TUPLE = 0x09
+DICT = 0x0a
+ORDERED_DICT = 0x0b
+SET = 0x0c
+FROZENSET = 0x0d
+SIZED = 0x20
+SIZED_LIST = SIZED + LIST
+SIZED_FROZENSET = SIZED + FROZENSET
+SHORT_STR = 0x40
+SHORT_STR_SIZE = 0x40
+SMALL_INT = 0x80
+SMALL_INT_SIZE = 0x80
+
+INT64 = struct.Struct(">q")
+FLOAT64 = struct.Struct(">d")
+SIZE = struct.Struct(">I")
+TAG_SIZE = struct.Struct(">BI")
+SIZED_HEADER = struct.Struct(">BII")
+
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+COLLECTION_TYPES = {TUPLE: tuple, SET: set, FROZENSET: frozenset}
+
+# the order matters: bool is int and OrderedDict is dict
+BASE_TYPES = [OrderedDict, dict, Mapping, bool, int, float, str, bytes, list, tuple, set, frozenset]
+
+
+class Encoder:
+    """
+    Writes values to the list of chunks, encoders are selected by the exact type of a value
+    Args:
+        sized (bool): if true containers are written with their size in bytes
+    """
+    def __init__(self, sized: bool = False):
+        self.sized = sized
+        self.chunks: List[bytes] = [MAGIC]
+        self.encoders: Dict[type, Callable[[Any], None]] = {
+            type(None): self.encode_none,
+            bool: self.encode_bool,
+            int: self.encode_int,
+            float: self.encode_float,
+            str: self.encode_str,
+            bytes: self.encode_bytes,
+            bytearray: self.encode_bytes,
+            list: self.collection_encoder(LIST),
+            tuple: self.collection_encoder(TUPLE),
+            set: self.collection_encoder(SET),
+            frozenset: self.collection_encoder(FROZENSET),
+            dict: self.dict_encoder(DICT),
+            OrderedDict: self.dict_encoder(ORDERED_DICT),
+            Mapping: self.dict_encoder(DICT),
+        }
+
+    def encode(self, value: Any) -> None:
+        encoder = self.encoders.get(type(value))
+        if encoder is not None:
+            encoder(value)
+            return
+
+        # subclasses are encoded as their base types
+        for base_type in BASE_TYPES:
+            if isinstance(value, base_type):
+                self.encoders[base_type](value)
+                return
+        raise TypeError(f"Object of type {type(value).__name__} is not supported by the binary format")
+
+    def encode_none(self, value: None) -> None:
+        self.chunks.append(b"\x00")
+
+    def encode_bool(self, value: bool) -> None:
+        self.chunks.append(b"\x02" if value else b"\x01")
+
+    def encode_int(self, value: int) -> None:
+        if 0 <= value < SMALL_INT_SIZE:
+            self.chunks.append(bytes((SMALL_INT + value,)))
+        elif INT64_MIN <= value <= INT64_MAX:
+            self.chunks.append(b"\x03")
+            self.chunks.append(INT64.pack(value))
+        else:
+            payload = value.to_bytes((value.bit_length() + 8) // 8, "big", signed=True)
+            self.chunks.append(TAG_SIZE.pack(BIG_INT, len(payload)))
+            self.chunks.append(payload)
+
+    def encode_float(self, value: float) -> None:
+        self.chunks.append(b"\x05")
+        self.chunks.append(FLOAT64.pack(value))
+
+    def encode_str(self, value: str) -> None:
+        payload = value.encode("utf-8", "surrogatepass")
+        if len(payload) < SHORT_STR_SIZE:
+            self.chunks.append(bytes((SHORT_STR + len(payload),)))
+        else:
+            self.chunks.append(TAG_SIZE.pack(STR, len(payload)))
+        self.chunks.append(payload)
+
+    def encode_bytes(self, value: bytes) -> None:
+        self.chunks.append(TAG_SIZE.pack(BYTES, len(value)))
+        self.chunks.append(bytes(value))
+
+    def collection_encoder(self, tag: int) -> Callable[[Any], None]:
+        def encode_items(value: Union[list, tuple, set, frozenset]) -> None:
+            for item in value:
+                self.encode(item)
+        return self.container_encoder(tag, encode_items)
+
+    def dict_encoder(self, tag: int) -> Callable[[Mapping], None]:
+        def encode_items(value: Mapping) -> None:
+            for key, item in value.items():
+                self.encode(key)
+                self.encode(item)
+        return self.container_encoder(tag, encode_items)
+
+    def container_encoder(self, tag: int, encode_items: Callable[[Any], None]) -> Callable[[Any], None]:
+        def encode_container(value: Any) -> None:
+            self.chunks.append(TAG_SIZE.pack(tag, len(value)))
+            encode_items(value)
+
+        def encode_sized_container(value: Any) -> None:
+            chunks = self.chunks
+            header = len(chunks)
+            chunks.append(b"")
+            encode_items(value)
+            size = sum(map(len, chunks[header + 1:]))
+            chunks[header] = SIZED_HEADER.pack(SIZED + tag, len(value), size)
+
+        return encode_sized_container if self.sized else encode_container
+
+
+class Decoder:
+    """
+    Reads values from the data, the position is moved past every decoded value
+    Args:
+        data (bytes): encoded storage, a memory map or a memoryview
+        ordered (bool): if true plain dicts are decoded as ``OrderedDict`` too
+        position (int, optional): position of a value to read, if None the data is checked to start with ``MAGIC``
+    Raises:
+        ValueError: if the data is not in the binary format
+    """
+    def __init__(self, data: Union[bytes, memoryview], ordered: bool = False, position: Optional[int] = None):
+        if position is None:
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError("Data is not in the safitty binary format")
+            position = len(MAGIC)
+
+        self.data = data
+        self.position = position
+        self.dict_type = OrderedDict if ordered else dict
+
+    def decode(self) -> Any:
+        data = self.data
+        tag = data[self.position]
+        self.position += 1
+
+        if tag >= SMALL_INT:
+            return tag - SMALL_INT
+
+        if tag >= SHORT_STR:
+            return self.payload(tag - SHORT_STR).decode("utf-8", "surrogatepass")
+
+        if tag == NONE:
+            return None
+        if tag == TRUE:
+            return True
+        if tag == FALSE:
+            return False
+        if tag == INT:
+            return INT64.unpack(self.payload(8))[0]
+        if tag == FLOAT:
+            return FLOAT64.unpack(self.payload(8))[0]
+
+        size = SIZE.unpack(self.payload(4))[0]
+        if SIZED_LIST <= tag <= SIZED_FROZENSET:
+            self.position += 4
+            tag -= SIZED
+
+        if tag == DICT or tag == ORDERED_DICT:
+            return self.decode_dict(self.dict_type() if tag == DICT else OrderedDict(), size)
+        if LIST <= tag <= FROZENSET:
+            items = [self.decode() for _ in range(size)]
+            return items if tag == LIST else COLLECTION_TYPES[tag](items)
+
+        return self.decode_bytes(tag, size)
+
+    def header(self) -> Tuple[int, int]:
+        """
+        Reads the header of a container, the position is moved to its first item
+        Returns:
+            Tuple[int, int]: the tag of the container without ``SIZED`` and the number of items
+        """
+        tag, size = TAG_SIZE.unpack_from(self.data, self.position)
+        self.position += TAG_SIZE.size
+        if SIZED_LIST <= tag <= SIZED_FROZENSET:
+            self.position += 4
+            tag -= SIZED
+        return tag, size
+
+    def skip(self) -> None:
+        """
+        Moves the position past the value, sized containers are not decoded
+        """
+        if SIZED_LIST <= self.data[self.position] <= SIZED_FROZENSET:
+            _, _, size = SIZED_HEADER.unpack_from(self.data, self.position)
+            self.position += SIZED_HEADER.size + size
+        else:
+            self.decode()
+
+    def decode_dict(self, value: dict, size: int) -> dict:
+        for _ in range(size):
+            key = self.decode()
+            value[key] = self.decode()
+        return value
+
+    def decode_bytes(self, tag: int, size: int) -> Union[str, bytes, int]:
+        if tag == STR:
+            return self.payload(size).decode("utf-8", "surrogatepass")
+        if tag == BYTES:
+            return self.payload(size)
+        if tag == BIG_INT:
+            return int.from_bytes(self.payload(size), "big", signed=True)
+        raise ValueError(f"Unknown tag 0x{tag:02x} in safitty binary data")
+
+    def payload(self, size: int) -> bytes:
+        start = self.position
+        end = self.position = start + size
+        if end > len(self.data):
+            raise ValueError("Truncated safitty binary data")
+        return bytes(self.data[start:end])
+
+
+def dumps(storage: Any, sized: bool = False) -> bytes:
+    """Encodes the storage to the binary format
+    Args:
+        storage (Any): config of None, bool, int, float, str, bytes, list, tuple,
+            dict, OrderedDict (and other mappings as dict), set and frozenset
+        sized (bool): if true containers are written with their size in bytes,
+            so ``safitty.shared`` can read a value without decoding the values before it
+    Returns:
+        bytes: encoded storage
+    Raises:
+        TypeError: if the storage has a value of another type
+    """
+    encoder = Encoder(sized=sized)
+    encoder.encode(storage)
+    return b"".join(encoder.chunks)
+
+
+def loads(data: Union[bytes, memoryview], ordered: bool = False) -> Any:
+    """Decodes the storage from the binary format
+    Args:
+        data (bytes): encoded storage
+        ordered (bool): if true plain dicts are decoded as ``OrderedDict`` too
+    Returns:
+        Any: decoded storage
+    Raises:
+        ValueError: if the data is not in the binary format or is truncated
+    """
+    decoder = Decoder(bytes(data), ordered=ordered)
+    try:
+        storage = decoder.decode()
+    except IndexError:
+        raise ValueError("Truncated safitty binary data")
+
+    if decoder.position != len(decoder.data):
+        raise ValueError("Extra data after the safitty binary storage")
+    return storage
@@ -0,0 +1,194 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Any, Union
+
+from safitty.types import Storage, MISSING
+
+
+class ParseCache:
+    """Cache of parsed configs for ``safitty.load``.
+    Parsed storages are kept pickled, so every hit returns a new copy which can be changed freely.
+    The in-process cache keeps the last ``memory_items`` configs.
+    If ``directory`` is set, configs are shared on disk between processes: files are written atomically
+    and the least recently used ones are removed when the directory gets bigger than ``max_size`` bytes.
+    Pickles are loaded from the directory, so use only a directory you trust
+    Args:
+        directory (Union[str, Path], optional): directory for the on-disk cache, if None caches only in memory
+        max_size (int): size limit of the on-disk cache in bytes
+        memory_items (int): number of configs in the in-process cache
+        hash_content (bool): if true the key contains a hash of the file content,
+            otherwise its modification time and size
+    Examples:
+        >>> cache = ParseCache("/tmp/safitty")
+        >>> config = safitty.load("./config.yml", cache=cache)
+    """
+    SUFFIX = ".pickle"
+
+    def __init__(
+            self,
+            directory: Optional[Union[str, Path]] = None,
+            max_size: int = 1024 ** 3,
+            memory_items: int = 64,
+            hash_content: bool = False,
+    ):
+        self.directory: Optional[Path] = None if directory is None else Path(directory)
+        self.max_size = max_size
+        self.memory_items = memory_items
+        self.hash_content = hash_content
+
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __getstate__(self) -> dict:
+        # a copy in another process shares only the on-disk cache
+        state = self.__dict__.copy()
+        state["_memory"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def key(self, path: Union[str, Path], *params: Any) -> str:
+        """
+        Makes the cache key of a file
+        Args:
+            path (Union[str, Path]): path to the file
+            *params: parameters of parsing which change the result, e.g. format and ``ordered``
+        Returns:
+            str: hex digest of the key
+        """
+        path = Path(path).resolve()
+        if self.hash_content:
+            version = hashlib.sha1(path.read_bytes()).hexdigest()
+        else:
+            stat = path.stat()
+            version = (stat.st_mtime_ns, stat.st_size)
+
+        return hashlib.sha1(repr((str(path), version, params)).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """
+        Finds the parsed storage
+        Args:
+            key (str): the key from ``ParseCache.key``
+        Returns:
+            Any: a copy of the storage or ``MISSING``
+        """
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+
+        if content is None and self.directory is not None:
+            file = self._file(key)
+            try:
+                content = file.read_bytes()
+                os.utime(file)
+            except OSError:
+                # there is no such file or it was evicted by another process
+                return MISSING
+            self._remember(key, content)
+
+        if content is None:
+            return MISSING
+
+        try:
+            return pickle.loads(content)
+        except Exception:
+            self.discard(key)
+            return MISSING
+
+    def put(self, key: str, storage: Optional[Storage]) -> None:
+        """
+        Caches the parsed storage
+        Args:
+            key (str): the key from ``ParseCache.key``
+            storage (Storage): parsed storage
+        """
+        content = pickle.dumps(storage, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, content)
+
+        if self.directory is None or len(content) > self.max_size:
+            return
+
+        descriptor, temp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as stream:
+                stream.write(content)
+            os.replace(temp_path, str(self._file(key)))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self.evict()
+
+    def discard(self, key: str) -> None:
+        """
+        Removes the key from the cache
+        """
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.directory is not None:
+            self._remove(self._file(key))
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used files until the on-disk cache fits into ``max_size``
+        """
+        if self.directory is None:
+            return
+
+        files = []
+        for file in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file))
+
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, file in sorted(files, key=lambda item: item[0]):
+            if size <= self.max_size:
+                break
+            self._remove(file)
+            size -= file_size
+
+    def clear(self) -> None:
+        """
+        Removes everything from the cache
+        """
+        with self._lock:
+            self._memory.clear()
+        if self.directory is not None:
+            for file in self.directory.glob(f"*{self.SUFFIX}"):
+                self._remove(file)
+
+    def _file(self, key: str) -> Path:
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def _remember(self, key: str, content: bytes) -> None:
+        if self.memory_items <= 0:
+            return
+        with self._lock:
+            self._memory[key] = content
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    @staticmethod
+    def _remove(file: Path) -> None:
+        try:
+            file.unlink()
+        except OSError:
+            pass
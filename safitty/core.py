@@ -1,9 +1,20 @@
-from copy import deepcopy
-from typing import Optional, Tuple, Any, List, Dict
+import builtins
+from collections import OrderedDict
+from collections.abc import Mapping
+from copy import deepcopy, copy as shallowcopy
+from typing import Optional, Tuple, Any, List, Dict, Iterator, Iterable, Union
 
 from safitty.types import Storage, Status, Strategy, \
-    Transform, Key, Relative, \
-    star, dstar
+    Transform, Key, Keys, Walker, Relative, MISSING, \
+    STAR, DSTAR
+
+
+# ``setup.py`` compiles this module with Cython if it's installed, then the compiled module is imported
+COMPILED = not __file__.endswith(".py")
+
+DICT_TYPES = (dict, OrderedDict)
+PLAIN_KEY_TYPES = (str, int, bool)
+KEY_TYPES = (str, int, Relative)
 
 
 # Checkers
@@ -11,32 +22,65 @@ def is_container(storage: Storage) -> bool:
     return hasattr(storage, "__setitem__")
 
 
-def need_last_value(status: int, value: Optional[Any], strategy: str) -> bool:
-    check_strategy = strategy == Strategy.LAST_VALUE
-    check_status = status != Status.OKAY or value is None
+def need_apply_function(value: Optional[Any], function: Optional[Transform]) -> bool:
+    return (value is not None) and (function is not None)
+
 
-    return check_strategy and check_status
+def unpacked(function: Transform) -> Transform:
+    """Wraps ``function`` to pass a list/tuple as ``*args`` and a dict as ``**kwargs``"""
+    def wrapper(value: Any) -> Any:
+        if isinstance(value, list) or isinstance(value, tuple):
+            return function(*value)
+        elif isinstance(value, dict):
+            return function(**value)
+        else:
+            return function(value)
 
+    return wrapper
 
-def need_default(status: int, value: Optional[Any], strategy: str) -> bool:
-    strategy_force = (strategy is None) and value is None
-    strategy_missing_key = (strategy == Strategy.MISSING_KEY) and (status in Status.WRONG_KEY)
 
-    return strategy_force or strategy_missing_key
+def resolve_function(
+        transform: Optional[Transform],
+        apply: Optional[Transform]
+) -> Optional[Transform]:
+    """Selects the function ``get`` applies to a found value. ``apply`` has a priority"""
+    if apply is not None:
+        return unpacked(apply)
+    return transform
 
 
-def need_apply_function(value: Optional[Any], function: Optional[Transform]) -> bool:
-    return (value is not None) and (function is not None)
+def apply_function(value: Optional[Any], function: Optional[Transform], raise_on_transforms: bool) -> Optional[Any]:
+    if not need_apply_function(value, function):
+        return value
+
+    try:
+        return function(value)
+    except Exception:
+        if raise_on_transforms:
+            raise
+        return None
+
+
+def keys_are_plain(keys: Keys) -> bool:
+    """Checks that all keys are exactly str, int or bool. Such keys can be compared as tuples"""
+    for key in keys:
+        if type(key) not in PLAIN_KEY_TYPES:
+            return False
+    return True
 
 
 def key_is_correct(key: Key) -> bool:
-    return isinstance(key, str) \
-           or isinstance(key, int) \
-           or isinstance(key, bool) \
-           or isinstance(key, Relative)
+    # bool is int
+    return isinstance(key, KEY_TYPES)
 
 
 def reformat_keys(keys: List[Key]) -> List[Key]:
+    for key in keys:
+        if isinstance(key, Relative):
+            break
+    else:
+        return list(keys)
+
     result: List[Key] = []
     relatives: List[Relative] = []
 
@@ -46,9 +90,9 @@ def reformat_keys(keys: List[Key]) -> List[Key]:
         if isinstance(key, Relative):
             if previous_is_key and current_is_dstar:
                 continue
-            if key == star():
+            if key is STAR:
                 relatives.append(key)
-            elif key == dstar():
+            elif key is DSTAR:
                 current_is_dstar = True
                 relatives = [key]
 
@@ -61,6 +105,7 @@ def reformat_keys(keys: List[Key]) -> List[Key]:
                 relatives = []
             result.append(key)
 
+    result += relatives
     return result
 
 # Getters
@@ -76,6 +121,10 @@ def get_value(storage: Storage, key: Optional[Key]) -> Tuple[int, Optional[Any]]
     if not key_is_correct(key):
         return Status.WRONG_KEY_TYPE, storage
 
+    # wildcards are resolved only by ``find``
+    if isinstance(key, Relative):
+        return Status.MISSING_KEY, None
+
     status: int = Status.OKAY
     result: Optional[Any] = None
 
@@ -97,6 +146,43 @@ def get_value(storage: Storage, key: Optional[Key]) -> Tuple[int, Optional[Any]]
     return status, result
 
 
+def get_child(storage: Optional[Storage], key: Optional[Key]) -> Tuple[int, Optional[Any]]:
+    """The same as ``get_value`` but reads plain dicts and lists directly"""
+    if type(storage) in DICT_TYPES and type(key) in PLAIN_KEY_TYPES:
+        value = storage.get(key, MISSING)
+        if value is MISSING:
+            return Status.MISSING_KEY, None
+        return Status.OKAY, value
+
+    if type(storage) is list and type(key) is int:
+        if 0 <= key < len(storage):
+            return Status.OKAY, storage[key]
+        return Status.MISSING_KEY, None
+
+    return get_value(storage, key)
+
+
+def select_value(
+        strategy: Optional[str],
+        default: Optional[Any],
+        status: int,
+        value: Optional[Any],
+        last_value: Optional[Any],
+        last_container: Optional[Any]
+) -> Optional[Any]:
+    """Selects the result of ``get`` by the strategy from the state of a full walk, see ``get_by_keys``"""
+    if strategy == Strategy.LAST_CONTAINER:
+        return last_container
+
+    if strategy == Strategy.LAST_VALUE:
+        return last_value if status != Status.OKAY or value is None else value
+
+    if strategy == Strategy.MISSING_KEY:
+        return default if status in Status.WRONG_KEY else value
+
+    return default if value is None else value
+
+
 def get_by_keys(
         storage: Optional[Storage],
         *keys: Key
@@ -144,6 +230,116 @@ def get_by_keys(
     return result
 
 
+# Walkers. Each of them finds the result of ``get`` for its own strategy
+# and tracks only the state that the strategy needs
+
+
+def walk_value(storage: Optional[Storage], keys: Keys, default: Optional[Any] = None) -> Optional[Any]:
+    """Walker for the default strategy: returns ``default`` if the value is None"""
+    value = storage
+    for key in keys:
+        if type(value) in DICT_TYPES and type(key) in PLAIN_KEY_TYPES:
+            value = value.get(key)
+        elif type(value) is list and type(key) is int:
+            value = value[key] if 0 <= key < len(value) else None
+        else:
+            status, value = get_value(value, key)
+            if status != Status.OKAY:
+                break
+
+        if value is None:
+            break
+
+    if value is None:
+        return default
+    return value
+
+
+def walk_missing_key(storage: Optional[Storage], keys: Keys, default: Optional[Any] = None) -> Optional[Any]:
+    """Walker for ``missing_key`` strategy: returns ``default`` only if some key is wrong or missing"""
+    value = storage
+    for key in keys:
+        if type(value) in DICT_TYPES and type(key) in PLAIN_KEY_TYPES:
+            value = value.get(key, MISSING)
+            if value is MISSING:
+                return default
+        elif type(value) is list and type(key) is int:
+            if not 0 <= key < len(value):
+                return default
+            value = value[key]
+        else:
+            status, value = get_value(value, key)
+            if status in Status.WRONG_KEY:
+                return default
+            if status != Status.OKAY:
+                break
+
+    return value
+
+
+def walk_last_value(storage: Optional[Storage], keys: Keys, default: Optional[Any] = None) -> Optional[Any]:
+    """Walker for ``last_value`` strategy: returns the last non-null value by the keys"""
+    value = storage
+    for key in keys:
+        if type(value) in DICT_TYPES and type(key) in PLAIN_KEY_TYPES:
+            next_value = value.get(key)
+        elif type(value) is list and type(key) is int:
+            next_value = value[key] if 0 <= key < len(value) else None
+        else:
+            status, next_value = get_value(value, key)
+            if status != Status.OKAY:
+                break
+
+        if next_value is None:
+            break
+        value = next_value
+
+    return value
+
+
+def walk_last_container(storage: Optional[Storage], keys: Keys, default: Optional[Any] = None) -> Optional[Any]:
+    """Walker for ``last_container`` strategy: returns the last non-null container by the keys"""
+    value = container = storage
+    for key in keys:
+        if type(value) in DICT_TYPES and type(key) in PLAIN_KEY_TYPES:
+            value = value.get(key)
+        elif type(value) is list and type(key) is int:
+            value = value[key] if 0 <= key < len(value) else None
+        else:
+            status, value = get_value(value, key)
+            if status != Status.OKAY:
+                break
+
+        if value is None:
+            break
+        if type(value) in DICT_TYPES or type(value) is list or is_container(value):
+            container = value
+
+    return container
+
+
+WALKERS: Dict[Optional[str], Walker] = {
+    None: walk_value,
+    Strategy.MISSING_KEY: walk_missing_key,
+    Strategy.LAST_VALUE: walk_last_value,
+    Strategy.LAST_CONTAINER: walk_last_container,
+}
+
+
+def get_walker(strategy: Optional[str]) -> Walker:
+    """Selects the walker for a ``get`` strategy
+    Args:
+        strategy (str): one of ``Strategy.ALL_FOR_GET`` or None
+    Returns:
+        Walker: function ``(storage, keys, default) -> value``
+    """
+    walker = WALKERS.get(strategy)
+    if walker is None:
+        raise ValueError(f"Strategy must be on of {Strategy.ALL_FOR_GET}. Got '{strategy}'")
+
+    return walker
+
+
 def get(
         storage: Optional[Storage],
         *keys: Key,
@@ -175,40 +371,9 @@ def get(
     Returns:
             Any: The result value or ``default``
         """
-    if strategy is not None and strategy not in Strategy.ALL_FOR_GET:
-        raise ValueError(f"Strategy must be on of {Strategy.ALL_FOR_GET}. Got '{strategy}'")
-
     keys = reformat_keys(keys)
-    result = get_by_keys(storage, *keys)
-
-    value = result["value"]
-    status = result["status"]
-
-    if strategy == Strategy.LAST_CONTAINER:
-        value = result["last_container"]
-
-    if need_last_value(status, value, strategy):
-        value = result["last_value"]
-
-    if need_default(status, value, strategy):
-        value = default
-
-    try:
-        if need_apply_function(value, apply):
-            if isinstance(value, list) or isinstance(value, tuple):
-                value = apply(*value)
-            elif isinstance(value, dict):
-                value = apply(**value)
-            else:
-                value = apply(value)
-
-        elif need_apply_function(value, transform):
-            value = transform(value)
-    except Exception:
-        if raise_on_transforms:
-            raise
-        else:
-            value = None
+    value = get_walker(strategy)(storage, keys, default)
+    value = apply_function(value, resolve_function(transform, apply), raise_on_transforms)
 
     if copy:
         value = deepcopy(value)
@@ -219,6 +384,94 @@ def get(
     return value
 
 
+# Wildcards
+def is_dstar(key: Key) -> bool:
+    return key is DSTAR
+
+
+def iter_children(storage: Optional[Storage]) -> Iterator[Tuple[Key, Any]]:
+    """Iterates over ``(key, value)`` pairs of a mapping or a list/tuple. Other values have no children"""
+    if isinstance(storage, Mapping):
+        return iter(storage.items())
+    if isinstance(storage, list) or isinstance(storage, tuple):
+        return enumerate(storage)
+    return iter(())
+
+
+def iter_paths(storage: Optional[Storage], path: Tuple[Key, ...] = ()) -> Iterator[Tuple[Tuple[Key, ...], Any]]:
+    """Iterates over ``(path, value)`` pairs of all nested values of the storage, depth-first
+    Args:
+        storage (Storage): The container to iterate over
+        path (Tuple[Key, ...]): the path of ``storage``, prepended to every path
+    Returns:
+        Iterator[Tuple[Tuple[Key, ...], Any]]: generator of ``(path, value)``
+    """
+    stack = [(path, storage)]
+    while stack:
+        path, value = stack.pop()
+        for key, child in iter_children(value):
+            child_path = path + (key,)
+            yield child_path, child
+            stack.append((child_path, child))
+
+
+def find_from(
+        storage: Optional[Storage],
+        keys: Keys,
+        position: int,
+        path: Tuple[Key, ...]
+) -> Iterator[Tuple[Tuple[Key, ...], Any]]:
+    if position == len(keys):
+        yield path, storage
+        return
+
+    key = keys[position]
+    if is_dstar(key):
+        yield from find_from(storage, keys, position + 1, path)
+        for child_key, child in iter_children(storage):
+            yield from find_from(child, keys, position, path + (child_key,))
+    elif isinstance(key, Relative):
+        for child_key, child in iter_children(storage):
+            yield from find_from(child, keys, position + 1, path + (child_key,))
+    else:
+        status, value = get_value(storage, key)
+        if status == Status.OKAY:
+            yield from find_from(value, keys, position + 1, path + (key,))
+
+
+def unique_paths(
+        matches: Iterator[Tuple[Tuple[Key, ...], Any]]
+) -> Iterator[Tuple[Tuple[Key, ...], Any]]:
+    seen = builtins.set()
+    for path, value in matches:
+        if path not in seen:
+            seen.add(path)
+            yield path, value
+
+
+def find(storage: Optional[Storage], *keys: Key) -> Iterator[Tuple[Tuple[Key, ...], Any]]:
+    """Finds all values by keys with wildcards. ``star()`` matches any key at one level,
+        ``dstar()`` matches any number of levels, including zero
+    Args:
+        storage (Storage): The container to search in
+        *keys (Key): Keys for the storage, param list of int, str or wildcards
+    Returns:
+        Iterator[Tuple[Tuple[Key, ...], Any]]: lazy generator of ``(path, value)`` for every match,
+            where ``path`` is a tuple of the real keys
+    Examples:
+        >>> list(find(config, "stages", dstar(), "lr"))
+        [(('stages', 'train', 'optimizer', 'lr'), 0.001), (('stages', 'finetune', 'optimizer', 'lr'), 0.0001)]
+    """
+    keys = reformat_keys(keys)
+    matches = find_from(storage, keys, 0, ())
+
+    # several ``dstar`` can reach the same path in different ways
+    if sum(1 for key in keys if is_dstar(key)) > 1:
+        matches = unique_paths(matches)
+
+    return matches
+
+
 # Setters
 def extend_container(container, key) -> Status:
     if isinstance(container, list):
@@ -248,6 +501,29 @@ def set_into_container(container, current_key, next_key) -> Tuple[Status, Option
         return Status.EXCEPTION_RAISED, None
 
 
+def copy_path(storage: Optional[Storage], keys: Keys) -> Optional[Storage]:
+    """Makes shallow copies of the storage and of the existing containers on the path to the last key.
+        A set by ``keys`` changes only these containers, so the copy shares everything else with ``storage``
+    Args:
+        storage (Storage): The container to copy
+        *keys (Key):  Keys for the storage, param list of int or str
+    Returns:
+        Storage: copy of the storage
+    """
+    updated_storage = shallowcopy(storage)
+    container = updated_storage
+    for key in keys[:-1]:
+        status, value = get_value(container, key)
+        if status != Status.OKAY or not is_container(value):
+            break
+
+        value = shallowcopy(value)
+        container[key] = value
+        container = value
+
+    return updated_storage
+
+
 def not_need_missing_key(on_missing_key: bool, strategy: str) -> bool:
     return (not on_missing_key) and strategy == Strategy.MISSING_KEY
 
@@ -261,7 +537,8 @@ def set(
         *keys: Key,
         value: Any,
         strategy: str = "force",
-        inplace: bool = True
+        inplace: bool = True,
+        copy_on_write: bool = False
 ) -> Optional[Storage]:
     """Setter for nested dictionaries/lists of any depth
     Args:
@@ -275,6 +552,8 @@ def set(
             - "existing_key" sets value only if all key were in storage
         inplace (bool): If True set value inplace into the storage, otherwise don't change the ``storage``
             params, returns only updated
+        copy_on_write (bool): Used if ``inplace`` is False. If True copies only the containers
+            on the path of ``keys`` instead of the whole storage, the rest is shared with ``storage``
     Returns:
         Storage: updated storage
     """
@@ -286,6 +565,8 @@ def set(
 
     if inplace:
         updated_storage = storage
+    elif copy_on_write:
+        updated_storage = copy_path(storage, keys)
     else:
         updated_storage = deepcopy(storage)
     result = get_by_keys(updated_storage, *keys)
@@ -343,3 +624,91 @@ def set(
             container[key] = value
 
     return updated_storage
+
+
+def build_set_trie(values: List[Tuple[Tuple[Key, ...], Any]]) -> Optional[list]:
+    """Groups writes into a trie for ``set_many``. Returns None if they can't be grouped:
+        a key is unhashable, a negative index or some write replaces the whole storage"""
+    root: list = [None, {}, False, False, values]
+    for keys, value in values:
+        if len(keys) == 0:
+            return None
+
+        node = root
+        for key in keys:
+            if type(key) is int and key < 0:
+                # negative indices alias other keys of the same list
+                return None
+            try:
+                child = node[1].get(key)
+            except TypeError:
+                return None
+
+            if child is None:
+                child = node[1][key] = [key, {}, False, False, []]
+            elif type(child[0]) is not type(key):
+                # 1 == True == 1.0, but they are different keys for lists
+                child[3] = True
+            child[4].append((keys, value))
+            node = child
+        node[2] = True
+
+    return root
+
+
+def set_from_trie(container: Storage, node: list, depth: int, strategy: str) -> None:
+    # node is [key, children, has own writes, mixed key types, writes of the subtree]
+    for child in node[1].values():
+        key, _, has_own_writes, mixed, writes = child
+
+        if not has_own_writes and not mixed:
+            status, value = get_child(container, key)
+            if status == Status.OKAY and is_container(value):
+                set_from_trie(value, child, depth + 1, strategy)
+                continue
+
+        # the child is replaced or created: its writes go one by one in the original order
+        for keys, value in writes:
+            set(container, *keys[depth:], value=value, strategy=strategy, inplace=True)
+
+
+def set_many(
+        storage: Optional[Storage],
+        values: Union[Mapping, Iterable[Tuple[Keys, Any]]],
+        strategy: str = "force",
+        inplace: bool = True
+) -> Optional[Storage]:
+    """Setter for many key paths at once. The result is the same as of ``set`` for every path in order.
+        With ``force`` and ``on_none`` strategies the writes are grouped into a trie,
+        so a common prefix of several paths is walked only once. Other strategies check that the keys exist,
+        and a write that extends a list adds keys, so their writes go one by one
+    Args:
+        storage (Storage): The container that set into. Usually it's a configuration file (yaml of json)
+        values (Union[Mapping, Iterable[Tuple[Keys, Any]]]): ``{keys: value}`` or pairs ``(keys, value)``
+            where ``keys`` is a tuple/list of keys
+        strategy (str): Setting strategy, see ``set``
+        inplace (bool): If True set values inplace into the storage,
+            otherwise copies the storage once and returns the updated copy
+    Returns:
+        Storage: updated storage
+    Examples:
+        >>> set_many(config, {("stages", "train", "lr"): 0.1, ("stages", "train", "epochs"): 10})
+    """
+    if strategy not in Strategy.ALL_FOR_SET:
+        raise ValueError(f"Strategy must be on of {Strategy.ALL_FOR_SET}. Got '{strategy}'")
+
+    if isinstance(values, Mapping):
+        values = values.items()
+    values = [(tuple(keys), value) for keys, value in values]
+
+    updated_storage = storage if inplace else deepcopy(storage)
+
+    # writes to other keys don't change the result of ``force`` and ``on_none``, so they can be reordered
+    root = build_set_trie(values) if strategy in (Strategy.FORCE, Strategy.ON_NONE) else None
+    if root is None:
+        for keys, value in values:
+            updated_storage = set(updated_storage, *keys, value=value, strategy=strategy, inplace=True)
+    else:
+        set_from_trie(updated_storage, root, 0, strategy)
+
+    return updated_storage
@@ -1,85 +1,397 @@
 import collections
+import collections.abc
 import copy as dcopy
+import threading
+from concurrent.futures import Executor
+from functools import lru_cache
 
-from typing import Iterator, Union, Any
+from typing import Iterator, Iterable, Union, Any, Tuple, Optional, List, Dict
 from pathlib import Path
 
+from . import aio
 from . import core
 from . import parser
-from .types import Storage, Key, Keys
+from .accessor import Accessor, get_many
+from .cache import ParseCache
+from .index import PathIndex
+from .lazy import LazyDict
+from .types import Storage, Key, Keys, Status, Strategy, Backend, Change, MISSING
 
 from pprint import pformat
 
 
-class Safict(collections.Mapping):
+SPLIT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=SPLIT_CACHE_SIZE)
+def split_key(key: str, separator: str) -> Tuple[str, ...]:
+    return tuple(key.split(separator))
+
+
+class Safict(collections.abc.Mapping):
     def __init__(
         self,
         storage: Storage = None,
         separator: str = None,
+        indexed: bool = False,
+        copy_on_write: bool = False,
+        track_changes: bool = False,
+        concurrent: bool = False,
     ):
+        """
+        Args:
+            storage (Storage): dict or list to wrap
+            separator (str): if not None, string keys are split by it
+            indexed (bool): if True the first deep ``get`` builds a flat index of all paths,
+                so the next deep reads cost one hash lookup.
+                The storage must be changed only through the Safict then
+            copy_on_write (bool): if True the storage is never changed in place.
+                Every ``set`` copies only the containers on the path of the keys
+                and shares the rest with the previous storage
+            track_changes (bool): if True every ``set`` is recorded to the journal,
+                see ``Safict.changes`` and ``Safict.diff``
+            concurrent (bool): if True the Safict can be shared between threads. Implies ``copy_on_write``:
+                writers take a lock, build a new version of the storage and publish it at once,
+                readers don't lock and see either the old or the new version, never a half-made one
+        """
         self._storage = storage or {}
-        self._original_storage = dcopy.deepcopy(self._storage)
         self.separator = separator
+        self.indexed = indexed
+        self.copy_on_write = copy_on_write or concurrent
+        self._index: Optional[PathIndex] = None
+        self._changes: Optional[List[Change]] = [] if track_changes else None
+        self._lock: Optional[threading.Lock] = threading.Lock() if concurrent else None
 
-    def _split_keys(self, keys: Keys) -> Keys:
-        _keys = []
-        if self.separator is not None:
-            for key in keys:
-                if type(key) == str:
-                    splits = key.split(self.separator)
-                else:
-                    splits = [key]
-                for elem in splits:
-                    _keys.append(elem)
-        else:
-            _keys = keys
+    @property
+    def concurrent(self) -> bool:
+        return self._lock is not None
+
+    @property
+    def track_changes(self) -> bool:
+        return self._changes is not None
+
+    def _split_keys(self, keys: Keys) -> Tuple[Key, ...]:
+        if self.separator is None:
+            return tuple(keys)
+
+        if len(keys) == 1 and type(keys[0]) is str:
+            return split_key(keys[0], self.separator)
+
+        _keys: Tuple[Key, ...] = ()
+        for key in keys:
+            if type(key) is str:
+                _keys += split_key(key, self.separator)
+            else:
+                _keys += (key,)
 
         return _keys
 
+    def path(self, *keys: Key) -> 'SafictPath':
+        """
+        Splits the keys once and binds them to the Safict
+        Returns:
+            (SafictPath): handle to get and set the value by the keys without parsing them again
+        Examples:
+            >>> dim = config.path("model.encoder.dim")
+            >>> dim.get(default=128)
+            256
+        """
+        return SafictPath(self, self._split_keys(keys))
+
+    def _get_index(self) -> PathIndex:
+        if self._index is None:
+            storage = self._storage
+            index = PathIndex(storage)
+            if self._lock is None:
+                self._index = index
+                return index
+
+            # a writer could publish a new storage while the index was built
+            with self._lock:
+                if self._index is None and self._storage is storage:
+                    self._index = index
+            return index
+        return self._index
+
+    def _can_use_index(self, keys: Keys, strategy: Optional[str]) -> bool:
+        # an indexed value is the result of a full walk,
+        # so strategies that look at the values above it can't use the index
+        return self.indexed \
+            and len(keys) > 1 \
+            and strategy in (None, Strategy.MISSING_KEY) \
+            and core.keys_are_plain(keys)
+
     def get(self, *keys: Key, cast_dict: bool = True, **get_params) -> Union['Safict', Any]:
         """
         Getter for dict
         """
         _keys = self._split_keys(keys)
-        result: Storage = core.get(self._storage, *_keys, **get_params)
+        return self._get(_keys, cast_dict, get_params)
+
+    def _get(self, keys: Tuple[Key, ...], cast_dict: bool, get_params: dict) -> Union['Safict', Any]:
+        storage, _keys = self._storage, keys
+        if self._can_use_index(keys, get_params.get("strategy")):
+            value = self._get_index().lookup(keys)
+            if value is not MISSING:
+                storage, _keys = value, ()
+
+        result: Storage = core.get(storage, *_keys, **get_params)
         if isinstance(result, dict) and cast_dict:
-            result = Safict(result, separator=self.separator)
+            result = self._cast_dict(result, keys, get_params)
 
         return result
 
+    def _cast_dict(self, result: dict, keys: Tuple[Key, ...], get_params: dict) -> 'Safict':
+        if self._is_value_by_keys(result, keys, get_params):
+            return SafictView(self, keys)
+        return self._wrap(result, indexed=False)
+
+    def get_many(
+        self,
+        paths: Iterable[Union[Key, Keys, Accessor]],
+        cast_dict: bool = True,
+        **get_params
+    ) -> List[Union['Safict', Any]]:
+        """
+        Getter for many paths at once, see ``safitty.get_many``.
+        A path is a key, a tuple/list of keys or an ``Accessor``
+        """
+        _paths: List[Union[Tuple[Key, ...], Accessor]] = []
+        for path in paths:
+            if isinstance(path, Accessor):
+                _paths.append(path)
+            elif isinstance(path, tuple) or isinstance(path, list):
+                _paths.append(self._split_keys(path))
+            else:
+                _paths.append(self._split_keys((path,)))
+
+        results = get_many(self._storage, _paths, **get_params)
+        if cast_dict:
+            for i, (path, result) in enumerate(zip(_paths, results)):
+                if isinstance(result, dict):
+                    if isinstance(path, Accessor):
+                        results[i] = self._wrap(result, indexed=False)
+                    else:
+                        results[i] = self._cast_dict(result, path, get_params)
+
+        return results
+
+    @staticmethod
+    def _is_value_by_keys(result: Any, keys: Keys, get_params: dict) -> bool:
+        # a view reads the dict again by its keys, so it must be the value by them,
+        # not a default, a transformed value or a value found by another strategy
+        changing_params = ("transform", "apply", "copy")
+        return get_params.get("strategy") in (None, Strategy.MISSING_KEY) \
+            and all(not get_params.get(param) for param in changing_params) \
+            and result is not get_params.get("default") \
+            and core.keys_are_plain(keys)
+
+    def find(self, *keys: Key) -> Iterator[Tuple[Tuple[Key, ...], Any]]:
+        """
+        Finds all values by keys with wildcards, see ``safitty.find``
+        """
+        _keys = self._split_keys(keys)
+        return core.find(self._storage, *_keys)
+
     def item(self) -> Any:
         return self._storage
 
     def to_dict(self) -> dict:
-        return dcopy.deepcopy(self._storage)
+        result = dcopy.deepcopy(self._storage)
+        if isinstance(result, LazyDict):
+            result = result.to_dict()
+        return result
 
     def set(self, *keys: Key, value, **set_params) -> 'Safict':
         _set_params = parser.update(dict(inplace=False), set_params)
         _keys = self._split_keys(keys)
+        result, changes = self._set(_keys, value, _set_params)
 
-        result: Storage = core.set(
-            self._storage,
-            *_keys, **_set_params,
-            value=value
-        )
+        return self._wrap(result, changes=changes)
+
+    def _set(self, keys: Tuple[Key, ...], value: Any, set_params: dict) -> Tuple[Storage, Optional[List[Change]]]:
+        if self._lock is None or not set_params["inplace"]:
+            return self._write(keys, value, set_params)
+
+        # writers are serialized, so no write is lost, readers don't wait
+        with self._lock:
+            return self._write(keys, value, set_params)
+
+    def _write(self, keys: Tuple[Key, ...], value: Any, set_params: dict) -> Tuple[Storage, Optional[List[Change]]]:
+        _set_params = dict(set_params)
+        _keys = keys
+
+        inplace = _set_params["inplace"]
+        if self.copy_on_write:
+            _set_params.update(inplace=False, copy_on_write=True)
+
+        def write() -> Storage:
+            return core.set(
+                self._storage,
+                *_keys, **_set_params,
+                value=value
+            )
+
+        old = MISSING
+        if self.track_changes:
+            old = self._get_or_missing(self._storage, _keys)
 
-        return Safict(result, separator=self.separator)
+        if not inplace or self._index is None or len(_keys) == 0:
+            result = write()
+        elif core.keys_are_plain(_keys):
+            result = self._index.update(self._storage, _keys, write)
+        else:
+            self._index = None
+            result = write()
+
+        changes = self._changes
+        if self.track_changes and len(_keys) > 0:
+            new = self._get_or_missing(result, _keys)
+            if new is not old:
+                change = Change(_keys, old, new)
+                if inplace:
+                    changes.append(change)
+                else:
+                    changes = changes + [change]
+
+        if inplace and len(_keys) > 0:
+            self._storage = result
+
+        return result, changes
+
+    @staticmethod
+    def _get_or_missing(storage: Storage, keys: Keys) -> Any:
+        return core.get(storage, *keys, strategy=Strategy.MISSING_KEY, default=MISSING)
+
+    def _check_track_changes(self) -> None:
+        if not self.track_changes:
+            raise ValueError("Changes are not tracked. Create Safict with `track_changes=True`")
+
+    def changes(self) -> List[Change]:
+        """
+        Journal of all sets since the creation
+        Returns:
+            (List[Change]): ``(keys, old, new)`` of every set that changed the storage,
+                ``MISSING`` marks a value that wasn't in the storage.
+                The values are not copied, with ``copy_on_write=True`` they stay as they were
+        """
+        self._check_track_changes()
+        return list(self._changes)
+
+    def diff(self) -> Dict[Tuple[Key, ...], Tuple[Any, Any]]:
+        """
+        Compares the changed values with their original values
+        Returns:
+            (Dict[Tuple[Key, ...], Tuple[Any, Any]]): ``{keys: (original, current)}`` of the changed values.
+                Nested changes of an already changed value are not listed
+        """
+        self._check_track_changes()
+        changes = self._changes
+        firsts: Dict[Tuple[Key, ...], int] = collections.OrderedDict()
+        for i, change in enumerate(changes):
+            firsts.setdefault(change.keys, i)
+
+        result: Dict[Tuple[Key, ...], Tuple[Any, Any]] = collections.OrderedDict()
+        for keys, first in firsts.items():
+            if any(keys[:i] in firsts for i in range(1, len(keys))):
+                continue
+
+            # nested values set before the first set of the keys have already changed the old value,
+            # they are restored from the latest one
+            original = changes[first].old
+            for change in reversed(changes[:first]):
+                if len(change.keys) > len(keys) and change.keys[:len(keys)] == keys:
+                    original = self._restore(original, change.keys[len(keys):], change.old)
+
+            current = self._get_or_missing(self._storage, keys)
+            if current is not original and current != original:
+                result[keys] = (original, current)
+
+        return result
+
+    @staticmethod
+    def _restore(storage: Storage, keys: Tuple[Key, ...], old: Any) -> Storage:
+        """
+        Sets the old value by the keys into a copy of the containers on the path, ``MISSING`` removes the key
+        """
+        if old is not MISSING:
+            return core.set(storage, *keys, value=old, inplace=False, copy_on_write=True)
+
+        result = core.copy_path(storage, keys)
+        status, parent = Status.OKAY, result
+        for key in keys[:-1]:
+            if status != Status.OKAY:
+                break
+            status, parent = core.get_value(parent, key)
+
+        if status == Status.OKAY and isinstance(parent, dict):
+            parent.pop(keys[-1], None)
+        elif status == Status.OKAY and isinstance(parent, list) and keys[-1] == len(parent) - 1:
+            parent.pop()
+        return result
 
     @staticmethod
     def load(
         path: Union[str, Path],
         data_format: str = None,
         ordered: bool = False,
-        encoding: str = "utf-8"
+        encoding: str = "utf-8",
+        indexed: bool = False,
+        copy_on_write: bool = False,
+        track_changes: bool = False,
+        backend: str = Backend.AUTO,
+        cache: Optional[ParseCache] = None,
+        lazy: bool = False,
+        concurrent: bool = False,
     ) -> 'Safict':
         result: Storage = parser.load(
             path,
             ordered=ordered,
             data_format=data_format,
-            encoding=encoding
+            encoding=encoding,
+            backend=backend,
+            cache=cache,
+            lazy=lazy
         )
 
-        return Safict(result)
+        return Safict(
+            result,
+            indexed=indexed, copy_on_write=copy_on_write, track_changes=track_changes, concurrent=concurrent
+        )
+
+    @staticmethod
+    async def aload(
+        path: Union[str, Path],
+        data_format: str = None,
+        ordered: bool = False,
+        encoding: str = "utf-8",
+        indexed: bool = False,
+        copy_on_write: bool = False,
+        track_changes: bool = False,
+        backend: str = Backend.AUTO,
+        cache: Optional[ParseCache] = None,
+        lazy: bool = False,
+        concurrent: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> 'Safict':
+        """
+        Coroutine version of ``Safict.load``, the file is read and parsed in a thread pool, see ``safitty.aload``
+        """
+        result: Storage = await aio.aload(
+            path,
+            executor=executor,
+            ordered=ordered,
+            data_format=data_format,
+            encoding=encoding,
+            backend=backend,
+            cache=cache,
+            lazy=lazy
+        )
+
+        return Safict(
+            result,
+            indexed=indexed, copy_on_write=copy_on_write, track_changes=track_changes, concurrent=concurrent
+        )
 
     def save(
         self,
@@ -88,6 +400,10 @@ class Safict(collections.Mapping):
         encoding: str = "utf-8",
         ensure_ascii: bool = False,
         indent: int = 2,
+        compact: bool = False,
+        backend: str = Backend.AUTO,
+        streaming: bool = False,
+        atomic: bool = True,
     ) -> None:
         parser.save(
             self._storage,
@@ -96,6 +412,10 @@ class Safict(collections.Mapping):
             encoding=encoding,
             ensure_ascii=ensure_ascii,
             indent=indent,
+            compact=compact,
+            backend=backend,
+            streaming=streaming,
+            atomic=atomic,
         )
 
     def copy(self) -> 'Safict':
@@ -104,20 +424,56 @@ class Safict(collections.Mapping):
         Returns:
             (Safict): new copy
         """
-        storage = dcopy.deepcopy(self._storage)
-        result = Safict(storage, self.separator)
+        result = self._wrap(self._copy_storage(), changes=self._changes)
 
         return result
 
     def with_separator(self, separator: str = None) -> 'Safict':
-        storage = dcopy.deepcopy(self._storage)
-        result = Safict(storage, separator)
+        result = Safict(
+            self._copy_storage(), separator,
+            indexed=self.indexed, copy_on_write=self.copy_on_write,
+            track_changes=self.track_changes, concurrent=self.concurrent,
+        )
+        if self.track_changes:
+            result._changes = list(self._changes)
+
+        return result
+
+    def _copy_storage(self) -> Storage:
+        if self.copy_on_write:
+            return self._storage
+        return dcopy.deepcopy(self._storage)
+
+    def _wrap(self, storage: Storage, indexed: bool = None, changes: List[Change] = None) -> 'Safict':
+        """
+        Creates a new Safict with the same parameters
+        """
+        result = Safict(
+            storage,
+            separator=self.separator,
+            indexed=self.indexed if indexed is None else indexed,
+            copy_on_write=self.copy_on_write,
+            track_changes=self.track_changes,
+            concurrent=self.concurrent,
+        )
+        if changes is not None:
+            result._changes = list(changes)
 
         return result
 
     def __copy__(self):
         return self.copy()
 
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        # a lock can't be pickled or copied, the new Safict makes its own
+        state["_lock"] = self.concurrent
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock() if state["_lock"] else None
+
     def __getitem__(self, keys: Union[Key, Keys]) -> Storage:
         if type(keys) == tuple:
             result = self.get(*keys)
@@ -126,10 +482,10 @@ class Safict(collections.Mapping):
         return result
 
     def __setitem__(self, keys: Union[Key, Keys], value: Any) -> None:
-        if type(keys) == tuple:
-            self.set(*keys, value=value, inplace=True)
-        else:
-            self.set(keys, value=value, inplace=True)
+        if type(keys) != tuple:
+            keys = (keys,)
+        _keys = self._split_keys(keys)
+        self._set(_keys, value, dict(inplace=True))
 
     def __len__(self) -> int:
         return self._storage.__len__()
@@ -148,3 +504,110 @@ class Safict(collections.Mapping):
     def __repr__(self) -> str:
         result = self.__str__()
         return result
+
+
+class SafictPath:
+    """
+    Keys of a Safict, split by the separator once. Created by ``Safict.path``
+    Args:
+        safict (Safict): Safict to read and write
+        keys (Tuple[Key, ...]): split keys
+    """
+    def __init__(self, safict: Safict, keys: Tuple[Key, ...]):
+        self.safict = safict
+        self.keys = keys
+
+    def get(self, cast_dict: bool = True, **get_params) -> Union[Safict, Any]:
+        """
+        Gets the value by the keys, see ``Safict.get``
+        """
+        return self.safict._get(self.keys, cast_dict, get_params)
+
+    def set(self, value: Any, **set_params) -> Safict:
+        """
+        Sets the value by the keys, see ``Safict.set``
+        """
+        return self.safict.set(*self.keys, value=value, **set_params)
+
+    def __call__(self, **get_params) -> Union[Safict, Any]:
+        return self.get(**get_params)
+
+    def __repr__(self) -> str:
+        return f"SafictPath{self.keys}"
+
+
+class SafictView(Safict):
+    """
+    Safict over a nested dict of another Safict, returned by ``Safict.get``.
+    It doesn't copy anything: all reads and writes go to the root Safict by the full keys,
+    so they use its storage, index, copy-on-write mode and changes journal.
+    The view always shows the current value by its keys
+    Args:
+        root (Safict): Safict that owns the storage
+        prefix (Tuple[Key, ...]): keys of the nested dict in the root storage
+    """
+    def __init__(self, root: Safict, prefix: Tuple[Key, ...]):
+        self._root = root
+        self._prefix = prefix
+
+    @property
+    def _storage(self) -> Storage:
+        # the root could replace the dict with another value since the view was made
+        storage = self._root._get(self._prefix, False, {})
+        return storage if isinstance(storage, collections.abc.Mapping) else {}
+
+    @property
+    def separator(self) -> Optional[str]:
+        return self._root.separator
+
+    @property
+    def indexed(self) -> bool:
+        return self._root.indexed
+
+    @property
+    def copy_on_write(self) -> bool:
+        return self._root.copy_on_write
+
+    @property
+    def _changes(self) -> Optional[List[Change]]:
+        return self._root._changes
+
+    @property
+    def concurrent(self) -> bool:
+        return self._root.concurrent
+
+    def _get(self, keys: Tuple[Key, ...], cast_dict: bool, get_params: dict) -> Union[Safict, Any]:
+        return self._root._get(self._prefix + keys, cast_dict, get_params)
+
+    def _set(self, keys: Tuple[Key, ...], value: Any, set_params: dict) -> Tuple[Storage, Optional[List[Change]]]:
+        if not set_params["inplace"]:
+            return self.detach()._set(keys, value, set_params)
+
+        self._root._set(self._prefix + keys, value, set_params)
+        return self._storage, self._changes
+
+    def changes(self) -> List[Change]:
+        """
+        Journal of the root Safict, the keys are full
+        """
+        return self._root.changes()
+
+    def diff(self) -> Dict[Tuple[Key, ...], Tuple[Any, Any]]:
+        """
+        Diff of the root Safict, the keys are full
+        """
+        return self._root.diff()
+
+    def detach(self) -> Safict:
+        """
+        Creates a standalone Safict over the nested dict, without copying it
+        Returns:
+            (Safict): new Safict
+        """
+        return Safict(
+            self._storage,
+            separator=self.separator,
+            indexed=self.indexed,
+            copy_on_write=self.copy_on_write,
+            concurrent=self.concurrent,
+        )
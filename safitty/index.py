@@ -0,0 +1,97 @@
+from typing import Optional, Any, Dict, Tuple, Callable
+
+from safitty import core
+from safitty.types import Storage, Key, Keys, Status, MISSING
+
+
+class PathIndex:
+    """Flat index of a storage: maps the full path of every nested value to the value.
+    A lookup by a path is one hash lookup instead of a walk through all levels.
+    The index relies on the storage being changed only through ``PathIndex.update``
+    Args:
+        storage (Storage): The container to index
+    """
+    def __init__(self, storage: Optional[Storage]):
+        self._paths: Dict[Tuple[Key, ...], Any] = dict(core.iter_paths(storage))
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def lookup(self, keys: Keys) -> Any:
+        """
+        Finds the value by its full path
+        Args:
+            keys (Keys): path of plain keys, see ``core.keys_are_plain``
+        Returns:
+            Any: the value or ``MISSING`` if the path is not in the storage
+        """
+        return self._paths.get(tuple(keys), MISSING)
+
+    def _node(self, storage: Optional[Storage], path: Tuple[Key, ...]) -> Any:
+        if len(path) == 0:
+            return storage
+        return self._paths.get(path, MISSING)
+
+    def _drop(self, path: Tuple[Key, ...]) -> None:
+        node = self._paths.pop(path, MISSING)
+        if node is not MISSING:
+            for child_path, _ in core.iter_paths(node, path):
+                self._paths.pop(child_path, None)
+
+    def _add(self, parent: Any, path: Tuple[Key, ...]) -> None:
+        status, node = core.get_value(parent, path[-1])
+        if status == Status.OKAY:
+            self._paths[path] = node
+            self._paths.update(core.iter_paths(node, path))
+
+    def changed_path(self, keys: Keys) -> Tuple[Key, ...]:
+        """
+        Finds the highest value that a set by ``keys`` can replace.
+        All values above it are containers which are changed in place.
+        Args:
+            keys (Keys): path of plain keys
+        Returns:
+            Tuple[Key, ...]: path of the value
+        """
+        keys = tuple(keys)
+        for i in range(1, len(keys)):
+            node = self._paths.get(keys[:i], MISSING)
+            if node is MISSING or not core.is_container(node):
+                return keys[:i]
+        return keys
+
+    def update(self, storage: Optional[Storage], keys: Keys, write: Callable[[], Storage]) -> Storage:
+        """
+        Calls ``write`` which sets a value by ``keys`` and updates only the changed subtree of the index
+        Args:
+            storage (Storage): the indexed storage
+            keys (Keys): path of plain keys of the set
+            write (Callable): function that sets the value into ``storage`` in place
+                or into its copy-on-write copy
+        Returns:
+            Storage: the result of ``write``, the new indexed storage
+        """
+        path = self.changed_path(keys)
+        parent = self._node(storage, path[:-1])
+
+        length: Optional[int] = None
+        if isinstance(parent, list):
+            length = len(parent)
+
+        self._drop(path)
+        result = write()
+
+        # with copy-on-write the containers above are new objects
+        parent = result
+        for i in range(1, len(path)):
+            _, parent = core.get_value(parent, path[i - 1])
+            self._paths[path[:i]] = parent
+        self._add(parent, path)
+
+        # a list can be extended by ``None`` up to the new index
+        if length is not None and len(parent) > length:
+            for i in range(length, len(parent)):
+                self._drop(path[:-1] + (i,))
+                self._add(parent, path[:-1] + (i,))
+
+        return result
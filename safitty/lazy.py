@@ -0,0 +1,279 @@
+import re
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from copy import deepcopy
+from mmap import mmap
+from typing import Optional, Any, Dict, Tuple, Callable, Iterator, Union
+
+from safitty.types import Key, MISSING
+
+
+# bytes of a JSON string with escapes or of one structural character
+JSON_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\],:]', re.DOTALL)
+JSON_SPACE = re.compile(rb"[ \t\r\n]*")
+JSON_BRACKETS = bytes.maketrans(b"{[}]", b"(())")
+JSON_NOT_BRACKETS = bytes(char for char in range(256) if char not in b"{[}]")
+
+# a line at the first column of a YAML file
+YAML_LINE = re.compile(rb"^(?=[^ \t\r\n])(.*)$", re.MULTILINE)
+YAML_KEY = re.compile(rb"""(?P<key>"[^"\\]*"|'[^']*'|[^\s#'"\-?:,\[\]{}&*!|>%@`<][^#]*?)[ \t]*:(?:[ \t\r]|$)""")
+YAML_CONTINUATION = re.compile(rb"(?:#|-[ \t\r]|-$)")
+YAML_DOCUMENT_START = re.compile(rb"---[ \t\r]*(?:#.*)?$")
+# anchors, aliases, tags and directives make sections depend on each other
+YAML_UNSUPPORTED = re.compile(rb"(?:^|[\s\[{,:])[&*!]\S|^%", re.MULTILINE)
+# quoted scalars and flow collections can span lines, then a line at the first column may be inside of them
+YAML_FLOW_START = re.compile(rb"""(?:^|[-?:,\[{])[ \t]*["'\[{]""", re.MULTILINE)
+YAML_FLOW_TOKEN = re.compile(
+    rb"""(?P<comment>\s#)|(?P<quoted>"(?:[^"\\\r\n]|\\.)*"|'(?:[^'\r\n]|'')*')|[^"'\[\]{}\s]+|."""
+)
+
+Spans = Dict[Key, Tuple[int, int]]
+
+
+class Span:
+    """
+    Bytes of a not yet parsed value
+    """
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+
+    def __repr__(self) -> str:
+        return f"Span({self.start}, {self.end})"
+
+
+class LazyDict(MutableMapping):
+    """Top-level mapping of a config file which parses a value only when it's accessed first time.
+    Keys and byte offsets of the values are indexed once, the file stays memory-mapped,
+    so it must not be rewritten in place while the dict is used
+    Args:
+        spans (Dict[Key, Tuple[int, int]]): byte offsets of the values in the file
+        parse (Callable[[int, int], Any]): parses a value by its offsets
+        ordered (bool): if true ``to_dict`` returns an ``OrderedDict``
+    """
+    def __init__(self, spans: Spans, parse: Callable[[int, int], Any], ordered: bool = False):
+        self._items: Dict[Key, Any] = {key: Span(start, end) for key, (start, end) in spans.items()}
+        self._parse = parse
+        self.ordered = ordered
+
+    def __getitem__(self, key: Key) -> Any:
+        value = self._items[key]
+        if type(value) is Span:
+            value = self._items[key] = self._parse(value.start, value.end)
+        return value
+
+    def __setitem__(self, key: Key, value: Any) -> None:
+        self._items[key] = value
+
+    def __delitem__(self, key: Key) -> None:
+        del self._items[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._items
+
+    def __iter__(self) -> Iterator[Key]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def is_loaded(self, key: Key) -> bool:
+        """
+        Checks that the value of the key is already parsed
+        """
+        return type(self._items[key]) is not Span
+
+    def to_dict(self) -> Union[dict, OrderedDict]:
+        """
+        Parses all values
+        Returns:
+            Union[dict, OrderedDict]: a plain dict with the same items
+        """
+        result = OrderedDict() if self.ordered else dict()
+        for key in self._items:
+            result[key] = self[key]
+        return result
+
+    def _derived(self, items: Dict[Key, Any]) -> 'LazyDict':
+        result = LazyDict({}, self._parse, self.ordered)
+        result._items = items
+        return result
+
+    def __copy__(self) -> 'LazyDict':
+        return self._derived(dict(self._items))
+
+    def __deepcopy__(self, memo: dict) -> 'LazyDict':
+        # not parsed values are immutable bytes of the file, only parsed values are copied
+        return self._derived({
+            key: value if type(value) is Span else deepcopy(value, memo)
+            for key, value in self._items.items()
+        })
+
+    def __repr__(self) -> str:
+        loaded = sum(1 for key in self._items if self.is_loaded(key))
+        return f"LazyDict({len(self)} keys, {loaded} loaded)"
+
+
+class JsonScanner:
+    """Finds keys and byte offsets of the values of a top-level JSON object.
+    Strings are skipped as whole tokens, so brackets inside them don't matter.
+    If the file has no backslashes, quotes always pair up, so chunks nested deeper than the top-level values
+    are skipped by counting brackets outside the strings
+    Args:
+        buffer (bytes): content of the file
+        parse_key (Callable[[bytes], Key]): decodes a key from its JSON string
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, buffer: Union[bytes, mmap], parse_key: Callable[[bytes], Key]):
+        self.buffer = buffer
+        self.parse_key = parse_key
+
+        self.spans: Spans = {}
+        self.depth = 0
+        self._key: Optional[Key] = None
+        self._value_start: Optional[int] = None
+
+    def scan(self) -> Optional[Spans]:
+        """
+        Returns:
+            Dict[Key, Tuple[int, int]]: spans of the values or None if the top level isn't an object
+        Raises:
+            ValueError: if the object is malformed
+        """
+        buffer, size = self.buffer, len(self.buffer)
+        position = JSON_SPACE.match(buffer).end()
+        if buffer[position:position + 1] != b"{":
+            return None
+
+        can_skip = buffer.find(b"\\") == -1
+        while position < size:
+            end = self._chunk_end(position) if can_skip else size
+            if self.depth <= 1 or not self._skip(buffer[position:end]):
+                if self._feed(position, end):
+                    return self.spans
+            position = end
+
+        raise ValueError("Unterminated JSON object")
+
+    def _chunk_end(self, position: int) -> int:
+        # chunks start and end outside of strings
+        end = self.buffer.find(b'"', position + self.CHUNK_SIZE)
+        if end == -1:
+            return len(self.buffer)
+        if self.buffer[position:end].count(b'"') % 2 == 1:
+            end += 1
+        return end
+
+    def _skip(self, chunk: bytes) -> bool:
+        # brackets outside of the strings as "(" and ")"
+        brackets = b"".join(chunk.split(b'"')[::2]).translate(JSON_BRACKETS, JSON_NOT_BRACKETS)
+        while b"()" in brackets:
+            brackets = brackets.replace(b"()", b"")
+
+        # only unmatched closing brackets followed by unmatched opening ones are left
+        closes = brackets.count(b")")
+        if self.depth - closes <= 1:
+            return False
+
+        self.depth += len(brackets) - 2 * closes
+        return True
+
+    def _feed(self, start: int, end: int) -> bool:
+        buffer = self.buffer
+        for token in JSON_TOKEN.finditer(buffer, start, end):
+            char = buffer[token.start()]
+            depth = self.depth
+            if char == 0x22 and depth == 1 and self._key is None:  # "
+                self._key = self.parse_key(token.group())
+            elif char == 0x3a and depth == 1:  # :
+                self._value_start = token.end()
+            elif depth == 1 and (char == 0x2c or char == 0x7d):  # , }
+                if self._key is not None:
+                    if self._value_start is None:
+                        raise ValueError(f"Expected ':' after the key {self._key!r}")
+                    self.spans[self._key] = (self._value_start, token.start())
+                self._key, self._value_start = None, None
+                if char == 0x7d:
+                    if JSON_SPACE.match(buffer, token.end()).end() != len(buffer):
+                        raise ValueError("Extra data after the JSON object")
+                    return True
+            if char == 0x7b or char == 0x5b:  # { [
+                self.depth += 1
+            elif char == 0x7d or char == 0x5d:  # } ]
+                self.depth -= 1
+        return False
+
+
+def scan_json(buffer: Union[bytes, mmap], parse_key: Callable[[bytes], Key]) -> Optional[Spans]:
+    """
+    Finds keys and byte offsets of the values of a top-level JSON object, see ``JsonScanner``
+    """
+    return JsonScanner(buffer, parse_key).scan()
+
+
+def flow_closes_on_line(buffer: Union[bytes, mmap], start: int) -> bool:
+    """
+    Checks that the quoted scalar or the flow collection at ``start`` ends on the same line
+    """
+    end = buffer.find(b"\n", start)
+    depth = 0
+    for token in YAML_FLOW_TOKEN.finditer(buffer, start, len(buffer) if end == -1 else end):
+        kind = token.lastgroup
+        if kind == "comment":
+            return False
+        if kind is None:
+            char = buffer[token.start()]
+            if char == 0x5b or char == 0x7b:  # [ {
+                depth += 1
+            elif char == 0x5d or char == 0x7d:  # ] }
+                depth -= 1
+            elif char == 0x22 or char == 0x27:  # an unterminated " or '
+                return False
+        if depth <= 0:
+            return True
+    return False
+
+
+def scan_yaml(buffer: Union[bytes, mmap], parse_key: Callable[[bytes], Key]) -> Optional[Spans]:
+    """Finds keys and byte offsets of the top-level sections of a YAML block mapping.
+    A section is a ``key:`` line at the first column with the lines below it.
+    Files with anchors, aliases, tags, directives, several documents, quoted scalars or flow collections
+    spanning lines or other top-level forms are not split
+    Args:
+        buffer (bytes): content of the file
+        parse_key (Callable[[bytes], Key]): parses a key from its text
+    Returns:
+        Dict[Key, Tuple[int, int]]: spans of the sections or None if the file can't be split
+    """
+    if YAML_UNSUPPORTED.search(buffer) is not None:
+        return None
+    for match in YAML_FLOW_START.finditer(buffer):
+        if not flow_closes_on_line(buffer, match.end() - 1):
+            return None
+
+    spans: Spans = {}
+    # a key can be None itself
+    key, start = MISSING, None
+    for line in YAML_LINE.finditer(buffer):
+        text = line.group(1)
+        match = YAML_KEY.match(text)
+        if match is None:
+            if text.startswith(b"#"):
+                continue
+            if key is MISSING and len(spans) == 0 and YAML_DOCUMENT_START.match(text) is not None:
+                continue
+            if key is MISSING or YAML_CONTINUATION.match(text) is None:
+                return None
+            continue
+
+        if key is not MISSING:
+            spans[key] = (start, line.start())
+        key, start = parse_key(match.group("key")), line.start()
+
+    if key is not MISSING:
+        spans[key] = (start, len(buffer))
+
+    return spans
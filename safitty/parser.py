@@ -7,18 +7,52 @@ Some methods were formatted and simplified.
     https://github.com/catalyst-team/catalyst
 """
 import argparse
+import ast
+import codecs
 import copy
+import gc
 import json
+import mmap
+import os
 import re
-from collections import OrderedDict, Mapping
+import secrets
+import stat
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 from pydoc import locate
-from typing import List, Any, Type, Optional, Union
+from typing import List, Dict, Any, Type, Optional, Union, Iterator, BinaryIO, Tuple
 
 import yaml
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from safitty import core
-from .types import Storage
+from . import binary
+from .cache import ParseCache
+from .lazy import LazyDict, scan_json, scan_yaml
+from .types import Storage, Key, Backend, ListStrategy, MISSING
+
+# JSON files bigger than this are decoded from a memory map instead of a read buffer
+JSON_MMAP_THRESHOLD = 16 * 1024 * 1024
+SAVE_BUFFER_SIZE = 1024 * 1024
+# integer literals of 19 digits and longer can overflow 64 bits, ``orjson`` turns them into floats.
+# Digits after a point are skipped, digits in strings only make the document be decoded by ``json``
+JSON_BIG_INT = re.compile(rb"(?<![\d.])\d{19}")
+
+# a value wrapped with quotes is not parsed as ``value:dtype``
+QUOTES_WRAP = re.compile("""^["'][^ ].*[^ ]["']$""")
+SCALAR_TYPES = (str, int, float, bool, type(None))
+CONTAINER_TYPES = {"set": set, "list": list, "dict": dict, "frozenset": frozenset}
+
+# types resolved by ``type_from_str``, including the names which are not types
+TYPE_REGISTRY: Dict[str, Optional[Type]] = {"str": str, "int": int, "float": float, "bool": bool}
 
 
 def argparser(**argparser_kwargs) -> argparse.ArgumentParser:
@@ -50,27 +84,57 @@ class OrderedLoader(yaml.Loader):
     pass
 
 
+# libyaml bindings are optional for PyYAML
+CLoader = getattr(yaml, "CLoader", None)
+CDumper = getattr(yaml, "CDumper", None)
+
+if CLoader is not None:
+    class OrderedCLoader(CLoader):
+        pass
+else:
+    OrderedCLoader = None
+
+
 def construct_mapping(loader, node):
     loader.flatten_mapping(node)
     return OrderedDict(loader.construct_pairs(node))
 
 
-OrderedLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct_mapping
-)
+for ordered_loader in [OrderedLoader, OrderedCLoader]:
+    if ordered_loader is not None:
+        ordered_loader.add_constructor(
+            yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct_mapping
+        )
+
+
+def yaml_loader(ordered: bool = False, backend: str = Backend.AUTO) -> Type[yaml.Loader]:
+    """
+    Selects YAML loader. ``auto`` backend uses libyaml loaders if PyYAML is built with them
+
+    Args:
+        ordered (bool): if true the loader constructs mappings as ``OrderedDict``
+        backend (str): ``auto`` or ``python``
+
+    Returns:
+        Type[Loader]: loader class for ``yaml.load``
+    """
+    if backend == Backend.AUTO and CLoader is not None:
+        return OrderedCLoader if ordered else CLoader
+
+    return OrderedLoader if ordered else yaml.Loader
 
 
 def is_file_supported(suffix: str) -> bool:
     """
-    Check a path to be supported by safitty (only YAML or JSON)
+    Check a path to be supported by safitty (YAML, JSON or safitty binary)
 
     Args:
         suffix (str): path extension
 
     Returns:
-        bool: File is YAML or JSON
+        bool: File is YAML, JSON or safitty binary
     """
-    return suffix in [".json", ".yml", ".yaml"]
+    return suffix in [".json", ".yml", ".yaml", ".sfb"]
 
 
 def is_path_readable(path: Union[Path, str]) -> bool:
@@ -87,23 +151,168 @@ def is_path_readable(path: Union[Path, str]) -> bool:
     return path.exists() and is_file_supported(path.suffix)
 
 
+@contextmanager
+def gc_paused():
+    """
+    Pauses the garbage collector. Decoded JSON has no reference cycles,
+    but its millions of new objects trigger many useless collections
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def load_json(
+    path: Union[str, Path],
+    ordered: bool = False,
+    encoding: str = "utf-8",
+    backend: str = Backend.AUTO
+) -> Optional[Storage]:
+    """Reads and decodes JSON file in one pass.
+    Uses ``orjson`` if it's installed, ``ordered`` and not UTF-8 files are decoded with ``json``.
+    Files bigger than ``JSON_MMAP_THRESHOLD`` are decoded from a memory map
+    Args:
+        path (str): path to JSON file
+        ordered (bool): if true the objects will be loaded as ``OrderedDict``
+        encoding (str): encoding to read the file
+        backend (str): ``auto`` or ``python``, the last one always uses ``json``
+    Returns:
+        (Storage): Decoded file or None if the file is empty
+    """
+    path = Path(path)
+
+    if not can_use_orjson(ordered, encoding, backend):
+        with path.open(encoding=encoding) as stream:
+            content = stream.read()
+        if content == "":
+            return None
+        return loads_json_str(content, ordered=ordered)
+
+    with path.open("rb") as stream:
+        size = path.stat().st_size
+        if size == 0:
+            return None
+
+        if size < JSON_MMAP_THRESHOLD:
+            return loads_json_bytes(stream.read())
+
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            with memoryview(buffer) as view:
+                return loads_json_bytes(view)
+
+
+def is_utf8(encoding: str) -> bool:
+    return encoding.lower().replace("_", "-") in ["utf-8", "utf8"]
+
+
+def can_use_orjson(ordered: bool, encoding: str, backend: str) -> bool:
+    return orjson is not None and backend == Backend.AUTO and not ordered and is_utf8(encoding)
+
+
+def loads_json_str(content: str, ordered: bool = False) -> Storage:
+    """
+    Decodes JSON with ``json``
+    """
+    object_pairs_hook = OrderedDict if ordered else None
+    with gc_paused():
+        return json.loads(content, object_pairs_hook=object_pairs_hook)
+
+
+def loads_json_bytes(content: Union[bytes, memoryview]) -> Storage:
+    """Decodes UTF-8 JSON with ``orjson``.
+    ``json`` decodes the documents with integers that may not fit into 64 bits, as ``orjson`` loses
+    their precision, and is the fallback for what ``orjson`` rejects: NaN and Infinity
+    """
+    with gc_paused():
+        if JSON_BIG_INT.search(content) is not None:
+            return json.loads(bytes(content).decode("utf-8"))
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return json.loads(bytes(content).decode("utf-8"))
+
+
+def load_lazy(
+    path: Path,
+    suffix: str,
+    ordered: bool = False,
+    encoding: str = "utf-8",
+    backend: str = Backend.AUTO
+) -> Optional[LazyDict]:
+    """Maps the file and indexes its top-level keys, the values are parsed on the first access.
+    See ``safitty.lazy.LazyDict``
+    Args:
+        path (Path): path to config file (YAML or JSON)
+        suffix (str): ``.json``, ``.yml`` or ``.yaml``
+        ordered (bool): if true the values will be loaded as ``OrderedDict``
+        encoding (str): encoding of the file
+        backend (str): ``auto`` or ``python``, see ``load``
+    Returns:
+        (LazyDict): Config or None if the file can't be loaded lazily:
+            it isn't UTF-8, is empty or its top level isn't a mapping which can be split
+    """
+    if suffix not in [".json", ".yml", ".yaml"] or not is_utf8(encoding) or path.stat().st_size == 0:
+        return None
+
+    with path.open("rb") as stream:
+        # the map stays valid after the file is closed
+        buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if suffix == ".json":
+        use_orjson = can_use_orjson(ordered, encoding, backend)
+
+        def parse(start: int, end: int) -> Any:
+            if use_orjson:
+                return loads_json_bytes(buffer[start:end])
+            return loads_json_str(buffer[start:end].decode(encoding), ordered=ordered)
+
+        spans = scan_json(buffer, parse_key=lambda token: json.loads(token.decode(encoding)))
+    else:
+        loader = yaml_loader(ordered=ordered, backend=backend)
+
+        def parse(start: int, end: int) -> Any:
+            section = yaml.load(buffer[start:end].decode(encoding), loader)
+            return next(iter(section.values()))
+
+        spans = scan_yaml(buffer, parse_key=lambda text: yaml.load(text.decode(encoding), loader))
+
+    if spans is None:
+        buffer.close()
+        return None
+
+    return LazyDict(spans, parse, ordered=ordered)
+
+
 def load(
     path: Union[str, Path],
     ordered: bool = False,
     data_format: str = None,
-    encoding: str = "utf-8"
+    encoding: str = "utf-8",
+    backend: str = Backend.AUTO,
+    cache: Optional[ParseCache] = None,
+    lazy: bool = False
 ) -> Storage:
-    """Loads config by giving path. Supports YAML and JSON files.
+    """Loads config by giving path. Supports YAML, JSON and safitty binary (``.sfb``) files.
     Args:
-        path (str): path to config file (YAML or JSON)
+        path (str): path to config file (YAML, JSON or safitty binary)
         ordered (bool): if true the config will be loaded as ``OrderedDict``
-        data_format (str): ``yaml``, ``yml`` or ``json``. If not specified,
+        data_format (str): ``yaml``, ``yml``, ``json`` or ``sfb``. If not specified,
             safitty looks at ``path.suffix``
         encoding (str): encoding to read the config
+        backend (str): ``auto`` uses libyaml and orjson if they are installed,
+            ``python`` uses pure python ``yaml.Loader`` and ``json``
+        cache (ParseCache, optional): cache of parsed configs, see ``safitty.ParseCache``
+        lazy (bool): if true and the top level of the file is a mapping, returns ``LazyDict``
+            which parses the value of a top-level key when it's accessed first time.
+            Lazy configs are not cached
     Returns:
         (Storage): Config
     Raises:
-        Exception: if path ``config_path`` doesn't exists or file format is not YAML or JSON
+        Exception: if path ``config_path`` doesn't exists or file format is not supported
     Examples:
         >>> load(path="./config.yml", ordered=True)
     """
@@ -122,24 +331,149 @@ def load(
     if not is_file_supported(suffix):
         raise ValueError(f"Unknown file format '{suffix}'")
 
+    if backend not in Backend.ALL:
+        raise ValueError(f"Backend must be on of {Backend.ALL}. Got '{backend}'")
+
+    if lazy:
+        storage = load_lazy(path, suffix, ordered=ordered, encoding=encoding, backend=backend)
+        if storage is not None:
+            return storage
+
+    if cache is not None:
+        key = cache.key(path, suffix, ordered, encoding, backend)
+        storage = cache.get(key)
+        if storage is not MISSING:
+            return storage
+
     storage = None
-    with path.open(encoding=encoding) as stream:
-        if suffix == ".json":
-            object_pairs_hook = OrderedDict if ordered else None
-            file = "\n".join(stream.readlines())
-            if file != "":
-                storage = json.loads(file, object_pairs_hook=object_pairs_hook)
+    if suffix == ".json":
+        storage = load_json(path, ordered=ordered, encoding=encoding, backend=backend)
 
-        elif suffix in [".yml", ".yaml"]:
-            loader = OrderedLoader if ordered else yaml.Loader
+    elif suffix in [".yml", ".yaml"]:
+        with path.open(encoding=encoding) as stream:
+            loader = yaml_loader(ordered=ordered, backend=backend)
             storage = yaml.load(stream, loader)
 
+    elif suffix == ".sfb":
+        data = path.read_bytes()
+        if len(data) > 0:
+            storage = binary.loads(data, ordered=ordered)
+
     if storage is None:
-        return dict()
+        storage = dict()
+
+    if cache is not None:
+        cache.put(key, storage)
 
     return storage
 
 
+@contextmanager
+def atomic_writer(path: Path, atomic: bool = True) -> Iterator[BinaryIO]:
+    """Opens the path for writing in binary mode.
+    If ``atomic`` the content is written to a temporary file in the same directory
+    which replaces the path only after it's written completely, so the path never holds a partial file.
+    The file isn't synced to the disk, a crash of the process is safe but a power loss may lose the last writes
+    Args:
+        path (Path): path to write
+        atomic (bool): if false writes to the path directly
+    """
+    if not atomic:
+        with path.open("wb", buffering=SAVE_BUFFER_SIZE) as stream:
+            yield stream
+        return
+
+    if path.is_symlink():
+        path = path.resolve()
+    mode = stat.S_IMODE(path.stat().st_mode) if path.exists() else None
+
+    temp_path = path.with_name(f".{path.name}.{secrets.token_hex(8)}.tmp")
+    descriptor = os.open(str(temp_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(descriptor, "wb", buffering=SAVE_BUFFER_SIZE) as stream:
+            yield stream
+        if mode is not None:
+            os.chmod(str(temp_path), mode)
+        os.replace(str(temp_path), str(path))
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+
+def write_json(
+    storage: Storage,
+    stream: BinaryIO,
+    encoding: str = "utf-8",
+    ensure_ascii: bool = False,
+    indent: Optional[int] = 2,
+    backend: str = Backend.AUTO,
+    streaming: bool = False,
+) -> None:
+    """Writes JSON to the binary stream. Uses ``orjson`` if it's installed and writes the same values as ``json``
+    (it formats float exponents shorter: ``1e-07`` as ``1e-7``),
+    otherwise one-shot ``json.dumps`` or, if ``streaming``, ``json`` encoder chunk by chunk
+    Args:
+        storage (Storage): config to save
+        stream (BinaryIO): binary stream to write
+        encoding (str): encoding of the text
+        ensure_ascii (bool): if True non-ASCII characters are escaped in JSON strings
+        indent (int, optional): indent of JSON, if None writes compact JSON without spaces
+        backend (str): ``auto`` or ``python``
+        streaming (bool): if true never holds the whole text in memory
+    """
+    separators = (",", ":") if indent is None else None
+
+    if not streaming and not ensure_ascii and indent in [None, 2] and can_use_orjson(False, encoding, backend):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent == 2 else 0)
+        try:
+            content = orjson.dumps(storage, option=option)
+            # orjson writes NaN and Infinity as null, ``json`` writes them as is
+            if b"null" not in content or is_json_finite(storage):
+                stream.write(content)
+                return
+        except TypeError:
+            # objects or integers which orjson doesn't support
+            pass
+
+    if streaming:
+        encoder = json.JSONEncoder(indent=indent, ensure_ascii=ensure_ascii, separators=separators)
+        writer = codecs.getwriter(encoding)(stream)
+        for chunk in encoder.iterencode(storage):
+            writer.write(chunk)
+    else:
+        content = json.dumps(storage, indent=indent, ensure_ascii=ensure_ascii, separators=separators)
+        stream.write(content.encode(encoding))
+
+
+def is_json_finite(storage: Storage) -> bool:
+    try:
+        json.dumps(storage, allow_nan=False, separators=(",", ":"))
+        return True
+    except ValueError:
+        return False
+
+
+def write_yaml(
+    storage: Storage,
+    stream: BinaryIO,
+    encoding: str = "utf-8",
+    compact: bool = False,
+    backend: str = Backend.AUTO,
+) -> None:
+    """Writes YAML to the binary stream. Uses libyaml ``CDumper`` if PyYAML is built with it
+    Args:
+        storage (Storage): config to save
+        stream (BinaryIO): binary stream to write
+        encoding (str): encoding of the text
+        compact (bool): if true writes collections in the flow style
+        backend (str): ``auto`` or ``python``
+    """
+    dumper = CDumper if backend == Backend.AUTO and CDumper is not None else yaml.Dumper
+    writer = codecs.getwriter(encoding)(stream)
+    yaml.dump(storage, writer, Dumper=dumper, default_flow_style=True if compact else False)
+
+
 def save(
     storage: Storage,
     path: Union[str, Path],
@@ -147,41 +481,63 @@ def save(
     encoding: str = "utf-8",
     ensure_ascii: bool = False,
     indent: int = 2,
+    compact: bool = False,
+    backend: str = Backend.AUTO,
+    streaming: bool = False,
+    atomic: bool = True,
 ) -> None:
     """
-    Saves config to file. Path must be either YAML or JSON
+    Saves config to file. Path must be either YAML, JSON or safitty binary (``.sfb``)
     Args:
         storage (Storage): config to save
         path (Union[str, Path]): path to save
-        data_format (str): ``yaml``, ``yml`` or ``json``. If not specified,
+        data_format (str): ``yaml``, ``yml``, ``json`` or ``sfb``. If not specified,
             safitty looks at ``path.suffix``
         encoding (str): Encoding to write file. Default is ``utf-8``
         ensure_ascii (bool): Used for JSON, if True non-ASCII
             characters are escaped in JSON strings.
         indent (int): Used for JSON
+        compact (bool): if true writes JSON without indents and spaces and YAML in the flow style
+        backend (str): ``auto`` uses libyaml and orjson if they are installed,
+            ``python`` uses pure python ``yaml.Dumper`` and ``json``
+        streaming (bool): Used for JSON, if true writes JSON chunk by chunk
+            instead of building the whole text in memory
+        atomic (bool): if true writes to a temporary file and renames it to the path,
+            so a crash never leaves a partial file
     """
     path = Path(path)
 
     if data_format is not None:
-        suffix = data_format
+        suffix = data_format.lower()
+        if not suffix.startswith("."):
+            suffix = f".{suffix}"
     else:
         suffix = path.suffix
 
     if not is_file_supported(suffix):
         raise ValueError(f"Unknown file format '{suffix}'")
 
-    with path.open(encoding=encoding, mode="w") as stream:
+    if backend not in Backend.ALL:
+        raise ValueError(f"Backend must be on of {Backend.ALL}. Got '{backend}'")
+
+    if isinstance(storage, LazyDict):
+        storage = storage.to_dict()
+
+    with atomic_writer(path, atomic=atomic) as stream:
         if suffix == ".json":
-            json.dump(
+            write_json(
                 storage, stream,
-                indent=indent, ensure_ascii=ensure_ascii
+                encoding=encoding, ensure_ascii=ensure_ascii, indent=None if compact else indent,
+                backend=backend, streaming=streaming
             )
         elif suffix in [".yml", ".yaml"]:
-            yaml.dump(storage, stream)
+            write_yaml(storage, stream, encoding=encoding, compact=compact, backend=backend)
+        elif suffix == ".sfb":
+            stream.write(binary.dumps(storage, sized=True))
 
 
 def type_from_str(dtype: str) -> Type:
-    """Returns type by giving string
+    """Returns type by giving string. Types are located once and kept in ``TYPE_REGISTRY``
     Args:
         dtype (str): string representation of type
     Returns:
@@ -194,7 +550,38 @@ def type_from_str(dtype: str) -> Type:
         >>> type(type_from_str("int"))
         type
     """
-    return locate(dtype)
+    try:
+        return TYPE_REGISTRY[dtype]
+    except KeyError:
+        pass
+
+    value_type = TYPE_REGISTRY[dtype] = locate(dtype)
+    return value_type
+
+
+def parse_container(value_type: str, value_content: str) -> Any:
+    """Parses ``value_content`` as arguments of the container type, e.g. ``[1, 2]`` or ``a=1`` for ``dict``.
+    Arguments must be Python literals, nothing is evaluated
+    Args:
+        value_type (str): ``set``, ``list``, ``dict`` or ``frozenset``
+        value_content (str): arguments of the type
+    Returns:
+        (Any): the container
+    Raises:
+        ValueError: if the arguments are not literals
+    """
+    call = ast.parse(f"{value_type}({value_content})", mode="eval").body
+    if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Name) or call.func.id != value_type:
+        raise ValueError(f"Wrong arguments of {value_type}: '{value_content}'")
+
+    args = [ast.literal_eval(arg) for arg in call.args]
+    kwargs = {}
+    for keyword in call.keywords:
+        if keyword.arg is None:
+            raise ValueError(f"Wrong arguments of {value_type}: '{value_content}'")
+        kwargs[keyword.arg] = ast.literal_eval(keyword.value)
+
+    return CONTAINER_TYPES[value_type](*args, **kwargs)
 
 
 def parse_content(value: str) -> Any:
@@ -224,8 +611,7 @@ def parse_content(value: str) -> Any:
         >>> parse_content("'[1,2]:list'")
         '[1,2]:list' # type is str
     """
-    quotes_wrap = """^["'][^ ].*[^ ]["']$"""
-    if re.match(quotes_wrap, value) is not None:
+    if QUOTES_WRAP.match(value) is not None:
         value_content = value[1:-1]
         return value_content
 
@@ -237,9 +623,9 @@ def parse_content(value: str) -> Any:
 
     result = value_content
 
-    if value_type in ["set", "list", "dict", "frozenset"]:
+    if value_type in CONTAINER_TYPES:
         try:
-            result = eval(f"{value_type}({value_content})")
+            result = parse_container(value_type, value_content)
         except Exception:
             result = value_content
     else:
@@ -250,6 +636,46 @@ def parse_content(value: str) -> Any:
     return result
 
 
+def parse_overrides(args: List[str]) -> List[Tuple[Tuple[Key, ...], Any]]:
+    """Parses arguments ``--key/key:dtype=value:dtype`` into key paths and values for ``core.set_many``.
+    Every path segment and common prefix of the paths is parsed once
+    Args:
+        args (List[str]): list of arguments
+    Returns:
+        (List[Tuple[Tuple[Key, ...], Any]]): key paths and values in the order of the arguments
+    """
+    segments: Dict[str, Key] = {}
+    prefixes: Dict[str, Tuple[Key, ...]] = {"": ()}
+    scalars: Dict[str, Any] = {}
+
+    def parse_path(path: str) -> Tuple[Key, ...]:
+        keys = prefixes.get(path)
+        if keys is None:
+            prefix, _, name = path.rpartition("/")
+            key = segments.get(name, MISSING)
+            if key is MISSING:
+                key = segments[name] = parse_content(name)
+            keys = prefixes[path] = parse_path(prefix) + (key,)
+        return keys
+
+    result = []
+    for argument in args:
+        path, separator, value = argument.partition("=")
+        if not separator:
+            raise ValueError(f"Argument must be in form `--key=value`. Got '{argument}'")
+        path = path.lstrip("-").strip("/")
+
+        parsed = scalars.get(value, MISSING)
+        if parsed is MISSING:
+            parsed = parse_content(value)
+            # mutable values can't be shared between paths
+            if type(parsed) in SCALAR_TYPES:
+                scalars[value] = parsed
+        result.append((parse_path(path), parsed))
+
+    return result
+
+
 def update_from_args(config: Storage, args: List[str]) -> Storage:
     """Updates configuration file with list of arguments
     Args:
@@ -258,42 +684,170 @@ def update_from_args(config: Storage, args: List[str]) -> Storage:
     Returns:
         (Storage): updated config
     """
-    updated_config = copy.deepcopy(config)
+    values = parse_overrides(args)
+    updated_config = core.set_many(config, values, inplace=False)
 
-    for argument in args:
-        names, value = argument.split("=")
-        names = names.lstrip("-").strip("/")
-
-        value = parse_content(value)
-        names = [parse_content(name) for name in names.split("/")]
+    return updated_config
 
-        updated_config = core.set(updated_config, *names, value=value)
 
-    return updated_config
+def value_kind(value: Any) -> Optional[type]:
+    value_type = type(value)
+    if value_type in core.DICT_TYPES:
+        return Mapping
+    if value_type is list:
+        return list
+    if value_type in core.PLAIN_KEY_TYPES or value is None:
+        return None
+    if isinstance(value, Mapping):
+        return Mapping
+    if isinstance(value, list):
+        return list
+    return None
+
+
+def merge_values(values: List[Any], stack: list, list_strategy: str, list_key: Optional[Key]) -> Any:
+    # only the last run of values of the same kind is merged, a value of another kind replaces the ones before it
+    last = values[-1]
+    kind = value_kind(last)
+    if kind is None or (kind is list and list_strategy == ListStrategy.REPLACE):
+        return last
+
+    start = len(values) - 1
+    while start > 0 and value_kind(values[start - 1]) is kind:
+        start -= 1
+    run = values[start:]
+
+    if len(run) == 1:
+        return last
+
+    if kind is list and list_strategy == ListStrategy.APPEND:
+        return [item for items in run for item in items]
+
+    result = copy.copy(run[0]) if kind is Mapping else []
+    stack.append((result, run))
+    return result
 
 
-def update(config: Storage, updated_config: Storage) -> Storage:
-    """Updates configuration with an additional config
+def merge_lists(result: list, run: List[list], stack: list, list_strategy: str, list_key: Optional[Key]) -> None:
+    if list_strategy == ListStrategy.MERGE_BY_INDEX:
+        for i in range(max(len(items) for items in run)):
+            values = [items[i] for items in run if i < len(items)]
+            result.append(merge_values(values, stack, list_strategy, list_key))
+        return
+
+    # merge by key: mappings with the same ``list_key`` are merged, other items are appended
+    groups: Dict[Any, List[Any]] = OrderedDict()
+    for items in run:
+        for item in items:
+            group = object()
+            if isinstance(item, Mapping) and list_key in item:
+                try:
+                    group = (list_key, item[list_key])
+                    hash(group)
+                except TypeError:
+                    group = object()
+            groups.setdefault(group, []).append(item)
+
+    for values in groups.values():
+        result.append(merge_values(values, stack, list_strategy, list_key))
+
+
+def update(
+        config: Storage,
+        *updated_configs: Storage,
+        list_strategy: str = ListStrategy.REPLACE,
+        list_key: Optional[Key] = None
+) -> Storage:
+    """Updates configuration with additional configs.
+    All configs are merged in one pass without recursion.
+    Only the mappings changed by the merge are copied, the result shares the rest of the values with the configs
     Args:
         config (Storage): configuration dict
-        updated_config (Storage): dict with updates
+        *updated_configs (Storage): dicts with updates, later ones have priority
+        list_strategy (str): how to merge lists,
+            ``replace`` - the last list replaces the others,
+            ``append`` - concatenates lists,
+            ``merge_by_index`` - merges items with the same index,
+            ``merge_by_key`` - merges mappings with the same value by ``list_key``, appends other items
+        list_key (Key, optional): key of list items for ``merge_by_key``
     Returns:
         (Storage): updated config
+    Examples:
+        >>> update({"layers": [{"name": "conv", "dim": 32}]}, {"layers": [{"name": "conv", "dim": 64}]},
+        >>>        list_strategy="merge_by_key", list_key="name")
+        {"layers": [{"name": "conv", "dim": 64}]}
     """
+    if list_strategy not in ListStrategy.ALL:
+        raise ValueError(f"List strategy must be on of {ListStrategy.ALL}. Got '{list_strategy}'")
+    if list_strategy == ListStrategy.MERGE_BY_KEY and list_key is None:
+        raise ValueError(f"'{ListStrategy.MERGE_BY_KEY}' strategy needs 'list_key'")
+
     result = copy.copy(config)
-    for k, v in updated_config.items():
-        if isinstance(v, Mapping):
-            result[k] = update(result.get(k, {}), v)
-        else:
-            result[k] = v
+    stack = [(result, [config, *updated_configs])]
+    while stack:
+        container, run = stack.pop()
+
+        if isinstance(container, list):
+            merge_lists(container, run, stack, list_strategy, list_key)
+            continue
+
+        # values of every key in the order of the configs, the container is a copy of the first one
+        values_by_key: Dict[Key, List[Any]] = {}
+        for mapping in run[1:]:
+            for key, value in mapping.items():
+                values = values_by_key.get(key)
+                if values is not None:
+                    values.append(value)
+                elif key in container:
+                    values_by_key[key] = [container[key], value]
+                else:
+                    values_by_key[key] = [value]
+
+        for key, values in values_by_key.items():
+            if len(values) == 1:
+                container[key] = values[0]
+            else:
+                container[key] = merge_values(values, stack, list_strategy, list_key)
+
     return result
 
 
+def load_many(
+        paths: List[Union[str, Path]],
+        workers: int = 1,
+        executor: Optional[Executor] = None,
+        **load_params
+) -> List[Storage]:
+    """Loads configs concurrently, see ``load``
+    Args:
+        paths (List[Union[str, Path]]): paths to config files (YAML or JSON)
+        workers (int): number of threads to read and parse the files, if 1 loads them one by one
+        executor (Executor, optional): executor to use instead of threads,
+            e.g. ``ProcessPoolExecutor`` for big YAML files
+        **load_params: parameters of ``load``
+    Returns:
+        List[Storage]: configs in the order of ``paths``
+    """
+    function = partial(load, **load_params)
+
+    if executor is not None:
+        return list(executor.map(function, paths))
+
+    if workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            return list(pool.map(function, paths))
+
+    return [function(path) for path in paths]
+
+
 def load_from_args(
         *,
         parser: Optional[argparse.ArgumentParser] = None,
         arguments: Optional[List[str]] = None,
-        ordered: bool = False
+        ordered: bool = False,
+        cache: Optional[ParseCache] = None,
+        workers: int = 1,
+        executor: Optional[Executor] = None
 ) -> (argparse.Namespace, Storage):
     """Parses command line arguments, loads config and updates it with unknown args
     Args:
@@ -301,12 +855,16 @@ def load_from_args(
             if none uses ``safitty.argparser()`` by default
         arguments (List[str], optional): arguments to parse, if None uses command line arguments
         ordered (bool): if True loads the config as an ``OrderedDict``
+        cache (ParseCache, optional): cache of parsed configs, see ``safitty.ParseCache``
+        workers (int): number of threads to load the configs, see ``load_many``
+        executor (Executor, optional): executor to load the configs, see ``load_many``
     Returns:
         (Namespace, Storage): arguments from args and a
             config dict with updated values from unknown args
     Examples:
         >>> load_from_args(
-        >>>    arguments="-C examples/config.json examples/another.yml --paths/jsons/0:int=uno".split()
+        >>>    arguments="-C examples/config.json examples/another.yml --paths/jsons/0:int=uno".split(),
+        >>>    workers=4
         >>> )
     """
     parser = parser or argparser()
@@ -314,11 +872,10 @@ def load_from_args(
     args, uargs = parser.parse_known_args(args=arguments)
     config = {}
     if hasattr(args, "config"):
-        config = load(args.config, ordered=ordered)
+        config = load(args.config, ordered=ordered, cache=cache)
 
     if hasattr(args, "configs"):
-        for i, config_path in enumerate(args.configs):
-            config_ = load(config_path, ordered=ordered)
-            config = update(config, config_)
+        configs = load_many(args.configs, workers=workers, executor=executor, ordered=ordered, cache=cache)
+        config = update(config, *configs)
     config = update_from_args(config, uargs)
     return args, config
@@ -0,0 +1,283 @@
+import mmap
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Optional, Any, Dict, Iterator, Union
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    resource_tracker = shared_memory = None
+
+from safitty import binary
+from safitty.dict import Safict
+from safitty.types import Storage, Key
+
+# names of the segments created by this process, they stay registered to be unlinked
+CREATED_SEGMENTS = set()
+
+
+class SharedDict(Mapping):
+    """Read-only dict over the binary storage of a ``SharedConfig``.
+    Nothing is decoded until it's read: a dict finds the offsets of its values on the first access,
+    nested dicts are views too, other values are decoded on every read.
+    ``copy.copy`` returns a plain dict with the same values, ``copy.deepcopy`` and ``to_dict`` decode everything
+    Args:
+        config (SharedConfig): config that owns the buffer
+        position (int): offset of the dict in the buffer
+    """
+    def __init__(self, config: 'SharedConfig', position: int):
+        self._config = config
+        self._position = position
+        self._offsets: Optional[Dict[Key, int]] = None
+
+    def _get_offsets(self) -> Dict[Key, int]:
+        offsets = self._offsets
+        if offsets is None:
+            decoder = self._config._decoder(self._position)
+            _, size = decoder.header()
+            data, position = decoder.data, decoder.position
+
+            offsets = {}
+            for _ in range(size):
+                # short strings and small ints are read in place, other values by the decoder
+                tag = data[position]
+                if binary.SHORT_STR <= tag < binary.SMALL_INT:
+                    end = position + 1 + tag - binary.SHORT_STR
+                    key = bytes(data[position + 1:end]).decode("utf-8", "surrogatepass")
+                    position = end
+                else:
+                    decoder.position = position
+                    key = decoder.decode()
+                    position = decoder.position
+                offsets[key] = position
+
+                tag = data[position]
+                if tag >= binary.SMALL_INT:
+                    position += 1
+                else:
+                    decoder.position = position
+                    decoder.skip()
+                    position = decoder.position
+            self._offsets = offsets
+        return offsets
+
+    def __getitem__(self, key: Key) -> Any:
+        return self._config._value(self._get_offsets()[key])
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._get_offsets()
+
+    def __iter__(self) -> Iterator[Key]:
+        return iter(self._get_offsets())
+
+    def __len__(self) -> int:
+        return len(self._get_offsets())
+
+    @property
+    def ordered(self) -> bool:
+        """
+        Checks that the dict was an ``OrderedDict``
+        """
+        return self._config._decoder(self._position).header()[0] == binary.ORDERED_DICT
+
+    def to_dict(self) -> Union[dict, OrderedDict]:
+        """
+        Decodes the dict with all nested values
+        Returns:
+            Union[dict, OrderedDict]: a plain dict
+        """
+        return self._config._decoder(self._position).decode()
+
+    def __copy__(self) -> Union[dict, OrderedDict]:
+        result = OrderedDict() if self.ordered else dict()
+        for key in self:
+            result[key] = self[key]
+        return result
+
+    def __deepcopy__(self, memo: dict) -> Union[dict, OrderedDict]:
+        return self.to_dict()
+
+    def __reduce__(self):
+        # another process attaches to the same buffer instead of copying the dict
+        return self._config._value, (self._position,)
+
+    def __repr__(self) -> str:
+        return f"SharedDict({len(self)} keys)"
+
+
+class SharedConfig:
+    """Resolved config serialized once into shared memory or a memory-mapped ``.sfb`` file.
+    Processes attach to it and read the config through zero-copy read-only views (see ``SharedDict``),
+    so the config is neither copied nor parsed again in every worker.
+    A pickled ``SharedConfig`` or ``SharedDict`` holds only the name of the segment or the path of the file.
+    Create it with ``SharedConfig.create``, ``SharedConfig.attach`` or ``SharedConfig.open``
+    Args:
+        buffer (Union[memoryview, mmap]): encoded storage, see ``safitty.binary.dumps`` with ``sized=True``
+        name (str, optional): name of the shared memory segment
+        path (Path, optional): path of the memory-mapped file
+        handle (Any): the ``SharedMemory`` or the ``mmap`` to close
+    Examples:
+        >>> shared = SharedConfig.create(safitty.load("./config.yml"))
+        >>> # in a worker process that got ``shared`` pickled
+        >>> shared.safict()["model", "encoder", "dim"]
+        256
+    """
+    def __init__(
+            self,
+            buffer: Union[memoryview, mmap.mmap],
+            name: Optional[str] = None,
+            path: Optional[Path] = None,
+            handle: Any = None,
+    ):
+        self._buffer = buffer
+        self.name = name
+        self.path = path
+        self._handle = handle
+        self._views: Dict[int, SharedDict] = {}
+
+        # checks the format
+        binary.Decoder(buffer)
+
+    @staticmethod
+    def create(storage: Optional[Storage], name: Optional[str] = None) -> 'SharedConfig':
+        """
+        Serializes the storage into a new shared memory segment.
+        The creator must call ``unlink`` when the config is not needed anymore
+        Args:
+            storage (Storage): resolved config
+            name (str, optional): name of the segment, if None a random name is used
+        Returns:
+            (SharedConfig): config over the segment
+        """
+        if shared_memory is None:
+            raise ImportError("multiprocessing.shared_memory requires Python 3.8+, use `SharedConfig.open`")
+
+        data = binary.dumps(storage, sized=True)
+        memory = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        memory.buf[:len(data)] = data
+        CREATED_SEGMENTS.add(memory._name)
+
+        return SharedConfig(memory.buf, name=memory.name, handle=memory)
+
+    @staticmethod
+    def attach(name: str) -> 'SharedConfig':
+        """
+        Attaches to a shared memory segment made by ``SharedConfig.create``
+        Args:
+            name (str): name of the segment
+        Returns:
+            (SharedConfig): config over the segment
+        """
+        if shared_memory is None:
+            raise ImportError("multiprocessing.shared_memory requires Python 3.8+, use `SharedConfig.open`")
+
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # before Python 3.13 the segment is tracked by every process that attaches to it
+            # and the resource tracker of the process unlinks it at exit
+            memory = shared_memory.SharedMemory(name=name)
+            if memory._name not in CREATED_SEGMENTS:
+                resource_tracker.unregister(memory._name, "shared_memory")
+
+        return SharedConfig(memory.buf, name=memory.name, handle=memory)
+
+    @staticmethod
+    def open(path: Union[str, Path]) -> 'SharedConfig':
+        """
+        Maps a ``.sfb`` file into memory, the file is shared between processes by the page cache.
+        The file must not be rewritten in place while it's mapped, ``safitty.save`` replaces it atomically
+        Args:
+            path (Union[str, Path]): path to a file saved by ``safitty.save``
+        Returns:
+            (SharedConfig): config over the file
+        """
+        path = Path(path)
+        with path.open("rb") as stream:
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return SharedConfig(buffer, path=path, handle=buffer)
+
+    def _decoder(self, position: int) -> binary.Decoder:
+        return binary.Decoder(self._buffer, position=position)
+
+    def _value(self, position: int) -> Any:
+        tag = self._buffer[position]
+        if binary.SIZED_LIST <= tag <= binary.SIZED_FROZENSET:
+            tag -= binary.SIZED
+
+        if tag == binary.DICT or tag == binary.ORDERED_DICT:
+            view = self._views.get(position)
+            if view is None:
+                view = self._views.setdefault(position, SharedDict(self, position))
+            return view
+
+        if tag == binary.LIST:
+            decoder = self._decoder(position)
+            _, size = decoder.header()
+
+            # a new list on every read, the dicts in it are views
+            result = []
+            for _ in range(size):
+                result.append(self._value(decoder.position))
+                decoder.skip()
+            return result
+
+        return self._decoder(position).decode()
+
+    @property
+    def storage(self) -> Any:
+        """
+        The config, a ``SharedDict`` if it's a dict
+        """
+        return self._value(len(binary.MAGIC))
+
+    def safict(self, **safict_params) -> Safict:
+        """
+        Wraps the config into a Safict. The views can't be changed,
+        with ``copy_on_write=True`` the Safict copies only the changed paths into plain dicts
+        Args:
+            **safict_params: parameters of ``Safict``
+        Returns:
+            (Safict): Safict over the views
+        """
+        return Safict(self.storage, **safict_params)
+
+    def to_dict(self) -> Any:
+        """
+        Decodes the whole config
+        """
+        return self._decoder(len(binary.MAGIC)).decode()
+
+    def close(self) -> None:
+        """
+        Detaches from the buffer, the views can't be read anymore
+        """
+        self._views.clear()
+        self._buffer = None
+        if self._handle is not None:
+            self._handle.close()
+
+    def unlink(self) -> None:
+        """
+        Removes the shared memory segment, it's freed when every process closes it
+        """
+        if self.name is not None:
+            self._handle.unlink()
+            CREATED_SEGMENTS.discard(self._handle._name)
+
+    def __enter__(self) -> 'SharedConfig':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __reduce__(self):
+        if self.name is not None:
+            return SharedConfig.attach, (self.name,)
+        return SharedConfig.open, (str(self.path),)
+
+    def __repr__(self) -> str:
+        source = f"name={self.name!r}" if self.name is not None else f"path={str(self.path)!r}"
+        return f"SharedConfig({source})"
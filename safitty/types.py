@@ -1,10 +1,26 @@
-from typing import Union, List, Any, Type, Callable, Mapping, Tuple
+from typing import Union, List, Any, Type, Callable, Mapping, Tuple, Optional, NamedTuple, Dict
 
 
 class Relative:
-    def __init__(self, pat: str = "*"):
-        assert pat in ["*", "**"]
-        self.pat = pat
+    """Wildcard key: ``*`` matches one level, ``**`` any number of levels.
+    There is only one instance of every pattern, ``Relative("*") is Relative("*")``,
+    so it can be compared by identity, copied and pickled as the same object and used as a dict key
+    Args:
+        pat (str): ``*`` or ``**``
+    """
+    __slots__ = ("pat",)
+    PATTERNS = ("*", "**")
+    _instances: Dict[str, 'Relative'] = {}
+
+    def __new__(cls, pat: str = "*") -> 'Relative':
+        instance = cls._instances.get(pat)
+        if instance is None:
+            if pat not in cls.PATTERNS:
+                raise ValueError(f"Pattern must be on of {list(cls.PATTERNS)}. Got '{pat}'")
+            instance = super().__new__(cls)
+            instance.pat = pat
+            cls._instances[pat] = instance
+        return instance
 
     def __str__(self) -> str:
         return self.pat
@@ -12,20 +28,58 @@ class Relative:
     def __repr__(self) -> str:
         return self.pat
 
-    def __eq__(self, other: 'Relative') -> bool:
-        return self.pat == other.pat
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Relative):
+            return self.pat == other.pat
+        return NotImplemented
 
+    def __hash__(self) -> int:
+        return hash((Relative, self.pat))
 
-__relative_star = Relative("*")
-__relative_dstar = Relative("**")
+    def __reduce__(self):
+        return Relative, (self.pat,)
+
+    def __copy__(self) -> 'Relative':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'Relative':
+        return self
+
+
+STAR = Relative("*")
+DSTAR = Relative("**")
 
 
 def star():
-    return __relative_star
+    return STAR
 
 
 def dstar():
-    return __relative_dstar
+    return DSTAR
+
+
+class Missing:
+    """Marker of a missing value, unlike ``None`` which can be a value itself"""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __reduce__(self) -> str:
+        return "MISSING"
+
+    def __bool__(self) -> bool:
+        return False
+
+
+MISSING = Missing()
+
+
+class Change(NamedTuple):
+    """A set recorded by ``Safict`` with ``track_changes=True``"""
+    keys: Tuple['Key', ...]
+    old: Any
+    new: Any
 
 
 class Status:
@@ -37,7 +91,7 @@ class Status:
     WRONG_STORAGE_TYPE = 5
     EXCEPTION_RAISED = 6
 
-    WRONG_KEY = [KEY_IS_NONE, MISSING_KEY, WRONG_KEY_TYPE]
+    WRONG_KEY = frozenset([KEY_IS_NONE, MISSING_KEY, WRONG_KEY_TYPE])
 
 
 class Strategy:
@@ -52,8 +106,25 @@ class Strategy:
     ALL_FOR_SET = [FORCE, ON_NONE, MISSING_KEY, EXISTING_KEY]
 
 
+class ListStrategy:
+    REPLACE = "replace"
+    APPEND = "append"
+    MERGE_BY_INDEX = "merge_by_index"
+    MERGE_BY_KEY = "merge_by_key"
+
+    ALL = [REPLACE, APPEND, MERGE_BY_INDEX, MERGE_BY_KEY]
+
+
+class Backend:
+    AUTO = "auto"
+    PYTHON = "python"
+
+    ALL = [AUTO, PYTHON]
+
+
 Storage = Union[Mapping, List[Any]]
 Key = Union[str, int, bool, Relative]
 Keys = Union[Tuple[Key, ...], List[Key]]
 
 Transform = Union[Type, Callable]
+Walker = Callable[[Optional[Storage], Keys, Optional[Any]], Optional[Any]]
@@ -6,8 +6,10 @@
 
 import io
 import os
+import warnings
 
-from setuptools import find_packages, setup
+from setuptools import Extension, find_packages, setup
+from setuptools.command.build_ext import build_ext
 
 # Package meta-data.
 NAME = "safitty"
@@ -31,6 +33,41 @@ def load_readme():
         return "\n" + f.read()
 
 
+def load_extensions():
+    """
+    Compiles ``safitty/core.py`` with Cython if it's installed, the compiled module is imported instead of the source.
+    Set ``SAFITTY_PURE_PYTHON=1`` to skip the compilation
+    """
+    if os.environ.get("SAFITTY_PURE_PYTHON"):
+        return []
+
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        return []
+
+    return cythonize(
+        [Extension(f"{NAME}.core", [os.path.join(NAME, "core.py")])],
+        compiler_directives={"language_level": 3, "annotation_typing": False, "binding": True},
+        quiet=True,
+    )
+
+
+class OptionalBuildExt(build_ext):
+    """The extensions are optional: if they can't be built, the pure Python modules are used"""
+    def run(self):
+        try:
+            super().run()
+        except Exception as error:
+            warnings.warn(f"Failed to compile the extensions, using pure Python: {error}")
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as error:
+            warnings.warn(f"Failed to compile {ext.name}, using pure Python: {error}")
+
+
 def load_version():
     context = {}
     with open(os.path.join(PROJECT_ROOT, NAME, "__version__.py")) as f:
@@ -50,6 +87,9 @@ setup(
     url=URL,
     packages=find_packages(exclude=["tests", "examples"]),
     install_requires=load_requirements(),
+    extras_require={"fast": ["orjson"]},
+    ext_modules=load_extensions(),
+    cmdclass={"build_ext": OptionalBuildExt},
     include_package_data=True,
     license="MIT",
     classifiers=[
@@ -0,0 +1,137 @@
+"""Micro-benchmarks for ``safitty.get``. Run with ``python -m tests.bench_core``"""
+import copy
+import importlib.util
+import timeit
+from pathlib import Path
+from types import MappingProxyType
+
+import safitty
+from safitty import core
+from safitty.types import Status, Strategy
+
+
+CONFIG = {
+    "model": {
+        "encoder": {
+            "layers": [{"dim": 128 * i, "dropout": None} for i in range(8)],
+            "activation": "relu",
+        },
+    },
+    "stages": {
+        "train": {"optimizer": {"name": "Adam", "params": {"lr": 1e-3}}},
+    },
+}
+
+CASES = [
+    ("found", ("model", "encoder", "layers", 3, "dim"), {}),
+    ("missing", ("model", "decoder", "layers", 3, "dim"), dict(default=0)),
+    ("missing_key", ("model", "encoder", "layers", 3, "dropout"), dict(default=0, strategy="missing_key")),
+    ("last_value", ("stages", "train", "optimizer", "params", "momentum"), dict(strategy="last_value")),
+    ("last_container", ("stages", "train", "optimizer", "name", "x"), dict(strategy="last_container")),
+]
+
+
+def get_by_keys_get(storage, *keys, strategy=None, default=None):
+    """``get`` as it was before walkers: through the result dict of ``get_by_keys``"""
+    keys = core.reformat_keys(keys)
+    result = core.get_by_keys(storage, *keys)
+    value, status = result["value"], result["status"]
+
+    if strategy == Strategy.LAST_CONTAINER:
+        value = result["last_container"]
+    if strategy == Strategy.LAST_VALUE and (status != Status.OKAY or value is None):
+        value = result["last_value"]
+    if (strategy is None and value is None) or (strategy == Strategy.MISSING_KEY and status in Status.WRONG_KEY):
+        value = default
+
+    return value
+
+
+def measure(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e9
+
+
+def main(number: int = 100000):
+    print(f"{'case':<16}{'get_by_keys':>14}{'get':>14}{'Accessor':>14}{'speedup':>10}")
+    for name, keys, params in CASES:
+        accessor = safitty.Accessor(*keys, **params)
+        assert get_by_keys_get(CONFIG, *keys, **params) == safitty.get(CONFIG, *keys, **params) == accessor(CONFIG)
+
+        before = measure(lambda: get_by_keys_get(CONFIG, *keys, **params), number)
+        after = measure(lambda: safitty.get(CONFIG, *keys, **params), number)
+        compiled = measure(lambda: accessor(CONFIG), number)
+        print(f"{name:<16}{before:>11.0f} ns{after:>11.0f} ns{compiled:>11.0f} ns{before / after:>9.1f}x")
+
+
+def read_only(storage):
+    """Read-only mappings are not plain dicts, so every level goes through ``core.get_value``"""
+    if isinstance(storage, dict):
+        return MappingProxyType({key: read_only(value) for key, value in storage.items()})
+    if isinstance(storage, list):
+        return tuple(read_only(value) for value in storage)
+    return storage
+
+
+def main_many(number: int = 2000):
+    paths = [
+        ("stages", "train", "optimizer", "params", name)
+        for name in ["lr", "momentum", "weight_decay", "betas", "eps"]
+    ] + [("model", "encoder", "layers", i, name) for i in range(8) for name in ["dim", "dropout"]]
+    trie = safitty.PathTrie(paths)
+
+    print(f"\n{len(paths)} paths{'get':>14}{'get_many':>14}{'PathTrie':>14}")
+    for name, storage in [("dict", CONFIG), ("read-only", read_only(CONFIG))]:
+        assert safitty.get_many(storage, paths) == trie(storage) == [safitty.get(storage, *keys) for keys in paths]
+
+        each = measure(lambda: [safitty.get(storage, *keys) for keys in paths], number)
+        many = measure(lambda: safitty.get_many(storage, paths), number)
+        compiled = measure(lambda: trie(storage), number)
+        print(f"{name:<10}{each / 1000:>11.1f} us{many / 1000:>11.1f} us{compiled / 1000:>11.1f} us")
+
+
+def main_checks(number: int = 1000000):
+    """Checks of every ``get``, ``before`` is a list of statuses and ``isinstance`` for every key type"""
+    statuses = list(Status.WRONG_KEY)
+
+    def before(key, status):
+        return (isinstance(key, str) or isinstance(key, int) or isinstance(key, bool)
+                or isinstance(key, safitty.types.Relative)) and status in statuses
+
+    print(f"\n{'check':<16}{'before':>14}{'after':>14}")
+    for key, status in [("lr", Status.OKAY), (safitty.star(), Status.WRONG_KEY_TYPE)]:
+        old = measure(lambda: before(key, status), number)
+        new = measure(lambda: core.key_is_correct(key) and status in Status.WRONG_KEY, number)
+        print(f"{repr(key):<16}{old:>11.0f} ns{new:>11.0f} ns")
+
+
+def main_compiled(number: int = 100000):
+    """The pure Python source of ``safitty.core`` against the imported module, compiled by ``setup.py`` with Cython"""
+    spec = importlib.util.spec_from_file_location("safitty._pure_core", str(Path(core.__file__).with_name("core.py")))
+    pure = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pure)
+
+    print(f"\ncompiled: {core.COMPILED}")
+    print(f"{'case':<20}{'pure':>14}{'imported':>14}{'speedup':>10}")
+    storage = copy.deepcopy(CONFIG)
+    cases = [
+        (f"get {name}", lambda module, keys=keys, params=params: module.get(CONFIG, *keys, **params))
+        for name, keys, params in CASES
+    ] + [
+        ("get_value", lambda module: module.get_value(CONFIG["model"], "encoder")),
+        ("get_by_keys", lambda module: module.get_by_keys(CONFIG, "model", "encoder", "layers", 3, "dim")),
+        ("set", lambda module: module.set(storage, "stages", "train", "optimizer", "params", "lr", value=0.1)),
+        ("set cow", lambda module: module.set(
+            CONFIG, "stages", "train", "epochs", value=10, inplace=False, copy_on_write=True
+        )),
+    ]
+    for name, case in cases:
+        before = measure(lambda: case(pure), number)
+        after = measure(lambda: case(core), number)
+        print(f"{name:<20}{before:>11.0f} ns{after:>11.0f} ns{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
+    main_many()
+    main_checks()
+    main_compiled()
@@ -0,0 +1,67 @@
+"""Contention benchmark of a Safict shared between threads. Run with ``python -m tests.bench_dict``"""
+import copy
+import threading
+import time
+
+from safitty import Safict
+
+from tests.bench_core import CONFIG
+
+
+class LockedSafict:
+    """Baseline: every read and write of a plain Safict takes one lock"""
+    def __init__(self, storage):
+        self.safict = Safict(storage)
+        self.lock = threading.Lock()
+
+    def get(self, *keys, **get_params):
+        with self.lock:
+            return self.safict.get(*keys, **get_params)
+
+    def __setitem__(self, keys, value):
+        with self.lock:
+            self.safict[keys] = value
+
+
+def run(safict, readers: int, writers: int, duration: float):
+    stop = threading.Event()
+    reads, writes = [0] * readers, [0] * writers
+
+    def read(i):
+        while not stop.is_set():
+            safict.get("model", "encoder", "layers", 3, "dim", cast_dict=False)
+            safict.get("stages", "train", "optimizer", "params", "lr", cast_dict=False)
+            reads[i] += 2
+
+    def write(i):
+        while not stop.is_set():
+            safict["stages", "train", "optimizer", "params", "lr"] = writes[i] * 1e-5
+            safict["stages", f"writer{i}", "step"] = writes[i]
+            writes[i] += 2
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(readers)] \
+        + [threading.Thread(target=write, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return sum(reads) / duration, sum(writes) / duration
+
+
+def main(duration: float = 1.0):
+    print(f"{'mode':<12}{'readers':>9}{'writers':>9}{'reads/s':>12}{'writes/s':>12}")
+    for readers, writers in [(8, 1), (8, 4), (32, 2)]:
+        for name, create in [
+            ("locked", lambda: LockedSafict(copy.deepcopy(CONFIG))),
+            ("concurrent", lambda: Safict(copy.deepcopy(CONFIG), concurrent=True)),
+            ("indexed", lambda: Safict(copy.deepcopy(CONFIG), concurrent=True, indexed=True)),
+        ]:
+            reads, writes = run(create(), readers, writers, duration)
+            print(f"{name:<12}{readers:>9}{writers:>9}{reads:>12.0f}{writes:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
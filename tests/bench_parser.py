@@ -0,0 +1,143 @@
+"""Benchmarks for ``safitty.load`` backends and formats. Run with ``python -m tests.bench_parser``"""
+import json
+import tempfile
+import timeit
+from pathlib import Path
+from pydoc import locate
+
+import yaml
+
+import safitty
+from safitty import parser
+from safitty.types import Backend
+
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+def measure(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 200):
+    print(f"libyaml: {parser.CLoader is not None}, orjson: {parser.orjson is not None}")
+    print(f"{'file':<16}{'ordered':>9}{'python':>14}{'auto':>14}{'speedup':>10}")
+    for path in sorted(EXAMPLES.glob("*.*")):
+        if not parser.is_file_supported(path.suffix):
+            continue
+
+        for ordered in [False, True]:
+            python = measure(lambda: safitty.load(path, ordered=ordered, backend=Backend.PYTHON), number)
+            auto = measure(lambda: safitty.load(path, ordered=ordered, backend=Backend.AUTO), number)
+            print(f"{path.name:<16}{str(ordered):>9}{python:>11.0f} us{auto:>11.0f} us{python / auto:>9.1f}x")
+
+
+def main_save(number: int = 200):
+    """Saving the examples, ``before`` is ``json.dump``/``yaml.dump`` to the final path"""
+    print(f"{'file':<16}{'compact':>9}{'before':>14}{'python':>14}{'auto':>14}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for path in sorted(EXAMPLES.glob("*.*")):
+            if not parser.is_file_supported(path.suffix):
+                continue
+            storage = safitty.load(path)
+            target = Path(directory) / path.name
+
+            def before():
+                with target.open("w", encoding="utf-8") as stream:
+                    if path.suffix == ".json":
+                        json.dump(storage, stream, indent=2, ensure_ascii=False)
+                    else:
+                        yaml.dump(storage, stream)
+
+            for compact in [False, True]:
+                old = measure(before, number)
+                python = measure(lambda: safitty.save(storage, target, compact=compact, backend=Backend.PYTHON), number)
+                auto = measure(lambda: safitty.save(storage, target, compact=compact, backend=Backend.AUTO), number)
+                print(f"{path.name:<16}{str(compact):>9}{old:>11.0f} us{python:>11.0f} us{auto:>11.0f} us"
+                      f"{old / auto:>9.1f}x")
+
+
+def realistic_config(stages: int = 50) -> dict:
+    return {
+        "model": {
+            "name": "resnet50",
+            "layers": [{"channels": 64 * 2 ** (i % 4), "kernel": 3, "stride": 1 + i % 2, "bias": False}
+                       for i in range(50)],
+        },
+        "stages": {
+            f"stage_{i}": {
+                "optimizer": {"name": "Adam", "params": {"lr": 1e-3 / (i + 1), "betas": [0.9, 0.999]}},
+                "epochs": 10 + i,
+                "callbacks": ["accuracy", "checkpoint", "early_stopping"],
+                "augmentations": {"flip": 0.5, "crop": [224, 224], "normalize": True},
+            }
+            for i in range(stages)
+        },
+        "labels": {str(i): f"class number {i}" for i in range(1000)},
+    }
+
+
+def main_formats(number: int = 50):
+    """Loading and saving of one config in every format, ``sfb`` is the safitty binary format"""
+    storage = realistic_config()
+    print(f"{'format':<12}{'load':>14}{'save':>14}{'size':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, suffix, backend in [
+            ("json", ".json", Backend.PYTHON),
+            ("json fast", ".json", Backend.AUTO),
+            ("yaml", ".yml", Backend.PYTHON),
+            ("yaml fast", ".yml", Backend.AUTO),
+            ("sfb", ".sfb", Backend.AUTO),
+        ]:
+            target = Path(directory) / f"config{suffix}"
+            save = measure(lambda: safitty.save(storage, target, backend=backend), number)
+            load = measure(lambda: safitty.load(target, backend=backend), number)
+            size = target.stat().st_size / 1024
+            print(f"{name:<12}{load:>11.0f} us{save:>11.0f} us{size:>9.1f} KB")
+
+
+def main_parse_content(number: int = 5):
+    """Parsing of override tokens of a generated sweep, ``before`` resolves every type with ``pydoc.locate``"""
+    tokens = [
+        token
+        for i in range(1000)
+        for token in [f"{i}:int", f"{i * 1e-4}:float", "True:bool", f"[{i}, {i + 1}]:list", f"stage_{i}"]
+    ]
+
+    def before():
+        for token in tokens:
+            content = token.rsplit(":", 1)
+            value_type = "str" if len(content) == 1 else content[1]
+            if value_type not in parser.CONTAINER_TYPES:
+                locate(value_type)
+
+    old = measure(before, number) / len(tokens)
+    new = measure(lambda: [parser.parse_content(token) for token in tokens], number) / len(tokens)
+    print(f"type resolution before: {old:.2f} us/token, parse_content: {new:.2f} us/token")
+
+
+def main_update_from_args(number: int = 5):
+    """Overrides of a sweep job, ``before`` parses every segment and value of every argument"""
+    config = realistic_config()
+    args = [
+        f"--stages/stage_{i % 50}/{name}"
+        for i in range(1000)
+        for name in [f"optimizer/params/lr={i * 1e-5}:float", f"epochs={i % 7}:int", "augmentations/flip=0.1:float"]
+    ]
+
+    def before():
+        values = []
+        for argument in args:
+            names, value = argument.split("=")
+            names = names.lstrip("-").strip("/")
+            values.append(([parser.parse_content(name) for name in names.split("/")], parser.parse_content(value)))
+        return safitty.set_many(config, values, inplace=False)
+
+    old = measure(before, number)
+    new = measure(lambda: safitty.update_from_args(config, args), number)
+    print(f"{len(args)} overrides: before {old / 1000:.1f} ms, update_from_args {new / 1000:.1f} ms, {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
+    main_save()
@@ -0,0 +1,39 @@
+"""Startup of a worker which gets the config pickled. Run with ``python -m tests.bench_shared``"""
+import pickle
+
+from safitty import Safict
+from safitty.shared import SharedConfig
+
+from tests.bench_parser import realistic_config, measure
+
+
+def main(number: int = 20):
+    storage = realistic_config(stages=2000)
+    safict = Safict(storage)
+    shared = SharedConfig.create(storage)
+    try:
+        print(f"{'worker gets':<20}{'pickle':>12}{'start':>14}{'first read':>14}")
+        for name, value in [("Safict", safict), ("SharedConfig", shared)]:
+            state = pickle.dumps(value)
+
+            def start():
+                worker = pickle.loads(state)
+                if isinstance(worker, SharedConfig):
+                    worker.close()
+
+            def first_read():
+                worker = pickle.loads(state)
+                config = worker.safict() if isinstance(worker, SharedConfig) else worker
+                config["stages", "stage_1999", "optimizer", "params", "lr"]
+                if isinstance(worker, SharedConfig):
+                    worker.close()
+
+            print(f"{name:<20}{len(state) / 1024:>9.0f} KB{measure(start, number):>11.0f} us"
+                  f"{measure(first_read, number):>11.0f} us")
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+if __name__ == "__main__":
+    main()
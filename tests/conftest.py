@@ -0,0 +1,58 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def config(request):
+    configuration = {
+        "words": {
+            "one": "uno",
+            "two": "dos",
+            "three": "tres",
+            "none": None
+        },
+        "key": {
+            "value": ["elem1", "elem2"]
+        },
+        "servers": {
+            "main-server": {
+                "address": "localhost:8888",
+                "password": "qwerty"
+            },
+
+            "broken-server": {
+                "password": "42"  # no address
+            },
+
+            "with-default-pass": {
+                "address": "https://github.com/TezRomacH/safitty"
+            },
+            "other": None
+        },
+        "numbers": [1, 2, -2, 4, 7],
+        "numbers2": {
+            "inner": [-1, -2]
+        },
+        "status": 400
+    }
+    return configuration
+
+
+@pytest.fixture(scope="module")
+def transforms(request):
+    transforms = [
+        {
+            'name': 'Normalize',
+            'function': 'ToTensor',
+            'params': None
+        },
+        {
+            'name': 'Padding',
+            'function': 'Pad',
+            'params': {
+                'fill': 3,
+                'padding_mode': 'reflect'
+            }
+        }
+    ]
+
+    return transforms
@@ -0,0 +1,67 @@
+import pytest
+import safitty
+
+from .test_core import Client, sum_args, KEYS
+
+
+@pytest.mark.parametrize("keys", KEYS)
+@pytest.mark.parametrize("strategy", [None, "missing_key", "last_value", "last_container"])
+def test_accessor_same_as_get(config, keys, strategy):
+    params = dict(strategy=strategy, default="default")
+    assert safitty.Accessor(*keys, **params)(config) == safitty.get(config, *keys, **params)
+
+
+def test_accessor_transformations(config):
+    main_client = safitty.Accessor("servers", "main-server", apply=Client)(config)
+    assert main_client == Client("localhost:8888", "qwerty")
+    assert safitty.Accessor("servers", "broken-server", apply=Client)(config) is None
+    with pytest.raises(TypeError):
+        safitty.Accessor("servers", "broken-server", apply=Client, raise_on_transforms=True)(config)
+
+    assert safitty.Accessor("numbers", apply=sum_args)(config) == 12
+    assert safitty.Accessor("numbers", transform=len, apply=sum_args)(config) == 12
+    assert safitty.Accessor("status", one_of=[200, 400])(config)
+
+    words = safitty.Accessor("words", copy=True)(config)
+    assert words == config["words"] and words is not config["words"]
+
+
+def test_accessor_many_storages(transforms):
+    name = safitty.Accessor("name", default="Identity")
+    assert [name(t) for t in transforms] == ["Normalize", "Padding"]
+    assert name({}) == "Identity"
+    assert name(None) == "Identity"
+
+    with pytest.raises(ValueError):
+        safitty.Accessor("name", strategy="force")
+
+
+@pytest.mark.parametrize("strategy", [None, "missing_key", "last_value", "last_container"])
+def test_get_many(config, strategy):
+    params = dict(strategy=strategy, default="default")
+    expected = [safitty.get(config, *keys, **params) for keys in KEYS]
+    assert safitty.get_many(config, KEYS, **params) == expected
+    assert safitty.get_many(config, [safitty.Accessor(*keys, **params) for keys in KEYS]) == expected
+    assert safitty.PathTrie(KEYS, **params)(config) == expected
+
+
+def test_get_many_walk(config):
+    keys = KEYS + [("words", safitty.star()), ("words", ["one"]), ("key", "value", 1, "bad", "worse")]
+    expected = [safitty.get(config, *path, default="default") for path in keys]
+    assert safitty.get_many(config, keys, default="default") == expected
+    assert safitty.get_many(config, iter(keys), default="default") == expected
+    assert safitty.get_many(None, keys) == [safitty.get(None, *path) for path in keys]
+
+
+def test_get_many_params(config):
+    paths = [
+        ("servers", "main-server"),
+        safitty.Accessor("servers", "main-server", apply=Client),
+        safitty.Accessor("numbers", transform=len),
+        ("numbers", 10),
+        ("servers", [1]),
+    ]
+    assert safitty.get_many(config, paths, default=0) == [
+        config["servers"]["main-server"], Client("localhost:8888", "qwerty"), 5, 0, config["servers"]
+    ]
+    assert safitty.get_many(config, []) == []
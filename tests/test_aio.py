@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import safitty
+from safitty import aio
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def write_configs(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"config{i}.yml"
+        path.write_text(f"common: {{value: {i}, list: [{i}]}}\nkey{i}: {i}\n", encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_aload(tmp_path, monkeypatch):
+    paths = write_configs(tmp_path, 3)
+    threads = []
+    load = aio.load
+
+    def load_in_thread(*args, **params):
+        threads.append(threading.get_ident())
+        return load(*args, **params)
+
+    monkeypatch.setattr(aio, "load", load_in_thread)
+
+    assert run(safitty.aload(paths[0], ordered=True)) == {"common": {"value": 0, "list": [0]}, "key0": 0}
+    assert run(safitty.aload_many(paths)) == [safitty.load(path) for path in paths]
+    assert threading.get_ident() not in threads
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        safict = run(safitty.Safict.aload(paths[1], executor=executor, concurrent=True))
+    assert safict["common", "value"] == 1
+    assert safict.concurrent
+
+
+def test_aload_from_args(tmp_path):
+    paths = write_configs(tmp_path, 4)
+    arguments = ["-C", *paths, "--common/value=42:int", "--key0=zero"]
+
+    args, config = run(safitty.aload_from_args(arguments=arguments))
+    assert args.configs == paths
+    assert config == safitty.load_from_args(arguments=arguments)[1]
+    assert config["common"] == {"value": 42, "list": [3]}
+    assert config["key0"] == "zero"
+
+
+def test_aload_concurrently(tmp_path, monkeypatch):
+    paths = write_configs(tmp_path, 4)
+    barrier = threading.Barrier(len(paths), timeout=5)
+
+    def load(path, **params):
+        # every file waits for the others, so they must be loaded at the same time
+        barrier.wait()
+        return safitty.load(path, **params)
+
+    monkeypatch.setattr(aio, "load", load)
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        assert len(run(safitty.aload_many(paths, executor=executor))) == len(paths)
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+
+import pytest
+
+import safitty
+from safitty import binary
+
+
+STORAGE = OrderedDict([
+    ("model", {"name": "resnet", "layers": [64, 128, 256], "dropout": 0.5, "bias": False}),
+    ("stages", {"train": {"lr": 1e-3, "epochs": 10 ** 30, "warmup": -7}, "valid": None}),
+    ("labels", {0: "cat", True: "dog", -1: "unknown", 2.5: "half", None: "none"}),
+    ("shape", (3, 224, 224)),
+    ("tags", {"a", "b"}),
+    ("frozen", frozenset([1, 2])),
+    ("raw", b"\x00\xff"),
+    ("text", "привет " * 20),
+    ("ints", [0, 127, 128, -1, 2 ** 63 - 1, -2 ** 63, 2 ** 63, -2 ** 64]),
+    ("", []),
+])
+
+
+def test_round_trip():
+    data = binary.dumps(STORAGE)
+    assert data.startswith(binary.MAGIC)
+
+    loaded = binary.loads(data)
+    assert loaded == STORAGE
+    assert type(loaded) is OrderedDict
+    assert type(loaded["model"]) is dict
+    assert type(loaded["shape"]) is tuple
+    assert type(loaded["tags"]) is set
+    assert type(loaded["frozen"]) is frozenset
+    assert list(loaded["labels"]) == list(STORAGE["labels"])
+    assert [type(key) for key in loaded["labels"]] == [type(key) for key in STORAGE["labels"]]
+
+    assert type(binary.loads(data, ordered=True)["model"]) is OrderedDict
+    assert type(binary.loads(memoryview(data))) is OrderedDict
+
+
+@pytest.mark.parametrize("value", [None, True, False, 0, -5, 1.5, "", "a" * 100, [], {}])
+def test_round_trip_scalars(value):
+    loaded = binary.loads(binary.dumps(value))
+    assert loaded == value
+    assert type(loaded) is type(value)
+
+
+def test_subclasses():
+    class Name(str):
+        pass
+
+    class Config(OrderedDict):
+        pass
+
+    loaded = binary.loads(binary.dumps(Config([(Name("a"), 1)])))
+    assert type(loaded) is OrderedDict
+    assert type(next(iter(loaded))) is str
+
+
+def test_errors():
+    data = binary.dumps(STORAGE)
+
+    with pytest.raises(ValueError):
+        binary.loads(b"{}")
+    with pytest.raises(ValueError):
+        binary.loads(data[:-1])
+    with pytest.raises(ValueError):
+        binary.loads(data + b"\x00")
+    with pytest.raises(ValueError):
+        binary.loads(binary.MAGIC + b"\x3f")
+    with pytest.raises(TypeError):
+        binary.dumps({"a": object()})
+
+
+@pytest.mark.parametrize("path, data_format", [("config.sfb", None), ("config.bin", "sfb")])
+def test_save_load(tmp_path, path, data_format):
+    path = tmp_path / path
+    safitty.save(STORAGE, path, data_format=data_format)
+    assert safitty.load(path, data_format=data_format) == STORAGE
+    assert type(safitty.load(path, data_format=data_format, ordered=True)["model"]) is OrderedDict
+    assert safitty.Safict.load(path, data_format=data_format)["stages", "train", "lr"] == 1e-3
+
+    path.write_bytes(b"")
+    assert safitty.load(path, data_format=data_format) == {}
+
+
+def test_is_file_supported():
+    assert safitty.is_file_supported(".sfb")
@@ -0,0 +1,88 @@
+import os
+
+import safitty
+from safitty import parser
+from safitty.types import MISSING
+
+
+def write_config(path, content, mtime):
+    path.write_text(content, encoding="utf-8")
+    os.utime(str(path), (mtime, mtime))
+
+
+def test_load_with_cache(tmp_path, monkeypatch):
+    path = tmp_path / "config.yml"
+    write_config(path, "a: {b: [1, 2]}\n", mtime=1000)
+    cache = safitty.ParseCache(tmp_path / "cache")
+
+    config = safitty.load(path, cache=cache)
+    assert config == {"a": {"b": [1, 2]}}
+    config["a"]["b"].append(3)
+
+    calls = []
+    monkeypatch.setattr(parser, "yaml_loader", lambda **params: calls.append(params))
+    assert safitty.load(path, cache=cache) == {"a": {"b": [1, 2]}}
+
+    # another process sees only the on-disk cache
+    other = safitty.ParseCache(tmp_path / "cache")
+    assert safitty.load(path, cache=other) == {"a": {"b": [1, 2]}}
+    assert calls == []
+    monkeypatch.undo()
+
+    assert type(safitty.load(path, ordered=True, cache=cache)) is not dict
+
+    write_config(path, "a: 1\n", mtime=2000)
+    assert safitty.load(path, cache=cache) == {"a": 1}
+    assert safitty.Safict.load(path, cache=other)["a"] == 1
+
+
+def test_cache_hash_content(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, '{"a": 1}', mtime=1000)
+    cache = safitty.ParseCache(hash_content=True)
+    key = cache.key(path, ".json")
+
+    write_config(path, '{"a": 1}', mtime=2000)
+    assert cache.key(path, ".json") == key
+    write_config(path, '{"a": 2}', mtime=2000)
+    assert cache.key(path, ".json") != key
+    assert cache.key(path, ".json") != cache.key(path, ".json", True)
+
+
+def test_cache_backends(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    write_config(path, '{"a": 123456789012345678901234567890}', mtime=1000)
+    cache = safitty.ParseCache()
+
+    assert safitty.load(path, backend="python", cache=cache) == {"a": 123456789012345678901234567890}
+
+    # backends can decode the file differently, so they don't share the cached storage
+    calls = []
+    load_json = parser.load_json
+    monkeypatch.setattr(parser, "load_json", lambda *args, **kwargs: calls.append(kwargs) or load_json(*args, **kwargs))
+    safitty.load(path, backend="auto", cache=cache)
+    safitty.load(path, backend="auto", cache=cache)
+    assert [call["backend"] for call in calls] == ["auto"]
+
+
+def test_cache_eviction(tmp_path):
+    cache = safitty.ParseCache(tmp_path, max_size=1000, memory_items=2)
+    for i in range(10):
+        cache.put(f"key{i}", {"value": "x" * 300})
+        os.utime(str(cache._file(f"key{i}")), (i, i))
+        cache.evict()
+
+    files = sorted(file.name for file in tmp_path.iterdir())
+    assert files == ["key7.pickle", "key8.pickle", "key9.pickle"]
+    assert len(cache._memory) == 2
+
+    assert cache.get("key0") is MISSING
+    assert cache.get("key7") == {"value": "x" * 300}
+
+    cache._file("key8").write_bytes(b"broken")
+    cache._memory.clear()
+    assert cache.get("key8") is MISSING
+    assert not cache._file("key8").exists()
+
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
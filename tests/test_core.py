@@ -1,63 +1,10 @@
 import copy
+import pickle
+from random import Random
 import pytest
 import safitty
-
-
-@pytest.fixture(scope="module")
-def config(request):
-    configuration = {
-        "words": {
-            "one": "uno",
-            "two": "dos",
-            "three": "tres",
-            "none": None
-        },
-        "key": {
-            "value": ["elem1", "elem2"]
-        },
-        "servers": {
-            "main-server": {
-                "address": "localhost:8888",
-                "password": "qwerty"
-            },
-
-            "broken-server": {
-                "password": "42"  # no address
-            },
-
-            "with-default-pass": {
-                "address": "https://github.com/TezRomacH/safitty"
-            },
-            "other": None
-        },
-        "numbers": [1, 2, -2, 4, 7],
-        "numbers2": {
-            "inner": [-1, -2]
-        },
-        "status": 400
-    }
-    return configuration
-
-
-@pytest.fixture(scope="module")
-def transforms(request):
-    transforms = [
-        {
-            'name': 'Normalize',
-            'function': 'ToTensor',
-            'params': None
-        },
-        {
-            'name': 'Padding',
-            'function': 'Pad',
-            'params': {
-                'fill': 3,
-                'padding_mode': 'reflect'
-            }
-        }
-    ]
-
-    return transforms
+from safitty import core
+from safitty.types import Status, Strategy, Relative, MISSING
 
 
 def test_safe_get(config):
@@ -97,6 +44,52 @@ def test_safe_get_strategies(config):
     assert safitty.get(config, "words", "none", default=42, strategy="missing_key") is None
 
 
+KEYS = [
+    (),
+    ("words",),
+    ("words", "one"),
+    ("words", "one", "two"),
+    ("words", "none"),
+    ("words", "none", "deeper"),
+    ("words", 1.5),
+    ("words", None),
+    ("key", 0),
+    ("key", "value", 1),
+    ("key", "value", 2),
+    ("key", "value", 1, "bad"),
+    ("key", "value", 3, "bad"),
+    ("key", "value", "elem1"),
+    ("servers", "main-server"),
+    ("servers", "other", "address"),
+    ("numbers", 4),
+    ("numbers", -1),
+    ("numbers", True),
+    ("status", "code"),
+]
+
+
+def get_by_keys_reference(storage, keys, strategy, default):
+    result = core.get_by_keys(storage, *keys)
+    value, status = result["value"], result["status"]
+
+    if strategy == Strategy.LAST_CONTAINER:
+        value = result["last_container"]
+    if strategy == Strategy.LAST_VALUE and (status != Status.OKAY or value is None):
+        value = result["last_value"]
+    if (strategy is None and value is None) or (strategy == Strategy.MISSING_KEY and status in Status.WRONG_KEY):
+        value = default
+
+    return value
+
+
+@pytest.mark.parametrize("keys", KEYS)
+@pytest.mark.parametrize("strategy", [None, "missing_key", "last_value", "last_container"])
+def test_walkers(config, keys, strategy):
+    walker = core.get_walker(strategy)
+    assert walker(config, keys, "default") == get_by_keys_reference(config, keys, strategy, "default")
+    assert walker(None, keys, "default") == get_by_keys_reference(None, keys, strategy, "default")
+
+
 class Client:
     def __init__(self, address: str, password: str = "12345"):
         self.address = address
@@ -199,3 +192,123 @@ def test_safe_set_2(transforms):
     params0 = safitty.get(transforms, 0, "params")
     assert params0 is not None
     assert params0 == "subtract"
+
+
+def test_find():
+    experiment = {
+        "stages": {
+            "train": {"optimizer": {"lr": 0.1}, "lr": 0.5},
+            "finetune": {"optimizer": {"lr": 0.01, "momentum": 0.9}},
+            "infer": [{"lr": 1}, {"batch_size": 2}],
+        },
+        "lr": 42,
+    }
+    star, dstar = safitty.star(), safitty.dstar()
+
+    assert list(safitty.find(experiment, "stages", star, "optimizer", "lr")) == [
+        (("stages", "train", "optimizer", "lr"), 0.1),
+        (("stages", "finetune", "optimizer", "lr"), 0.01),
+    ]
+    assert list(safitty.find(experiment, "stages", dstar, "lr")) == [
+        (("stages", "train", "lr"), 0.5),
+        (("stages", "train", "optimizer", "lr"), 0.1),
+        (("stages", "finetune", "optimizer", "lr"), 0.01),
+        (("stages", "infer", 0, "lr"), 1),
+    ]
+    assert list(safitty.find(experiment, dstar, "momentum")) == [
+        (("stages", "finetune", "optimizer", "momentum"), 0.9)
+    ]
+    assert list(safitty.find(experiment, "stages", "infer", star)) == [
+        (("stages", "infer", 0), {"lr": 1}),
+        (("stages", "infer", 1), {"batch_size": 2}),
+    ]
+    assert list(safitty.find(experiment, "stages", "eval", star)) == []
+    assert list(safitty.find(experiment, "lr", star)) == []
+
+    paths = [path for path, _ in safitty.find(experiment, dstar, "optimizer", dstar, "lr")]
+    assert len(paths) == len(set(paths)) == 2
+
+    assert safitty.get(experiment, "stages", star, "lr") is None
+    assert safitty.get(experiment, "stages", star, default=0) == 0
+
+
+def test_relative():
+    star, dstar = safitty.star(), safitty.dstar()
+    assert Relative("*") is star and Relative("**") is dstar
+    assert copy.copy(star) is star and copy.deepcopy([dstar])[0] is dstar
+    assert pickle.loads(pickle.dumps(dstar)) is dstar
+    assert pickle.loads(pickle.dumps(MISSING)) is MISSING
+
+    assert star == Relative() and star != dstar
+    assert star != "*" and "*" != star and star not in ["*", 1, None]
+    assert {star: 1, dstar: 2, "*": 3}[star] == 1
+    assert len({star, dstar, Relative("*")}) == 2
+    with pytest.raises(ValueError):
+        Relative("***")
+    with pytest.raises(AttributeError):
+        star.other = 1
+
+    assert isinstance(Status.WRONG_KEY, frozenset)
+    assert safitty.get_many({"a": {"b": 1}}, [("a", star), ("a", "b")]) == [None, 1]
+
+
+def test_safe_set_copy_on_write(config):
+    updated = safitty.set(config, "servers", "other", "address", value="localhost", inplace=False, copy_on_write=True)
+    assert safitty.get(updated, "servers", "other", "address") == "localhost"
+    assert safitty.get(config, "servers", "other") is None
+
+    assert updated["servers"] is not config["servers"]
+    assert updated["servers"]["main-server"] is config["servers"]["main-server"]
+    assert updated["numbers"] is config["numbers"]
+
+
+SET_MANY_VALUES = [
+    [(("words", "one"), "uno"), (("words", "two"), "dos"), (("servers", "main-server", "port"), 80)],
+    [(("a",), 1), (("a", "b"), 2), (("a",), 3)],
+    [(("a", "b"), 1), (("a",), {"c": 2}), (("a", "d"), 3)],
+    [(("numbers", 7), 42), (("numbers", 1), 0), (("numbers", 7, "x"), 1)],
+    [(("numbers", 1), "int"), (("numbers", True), "bool")],
+    [(("numbers", -1), 0), (("numbers", 4), 1)],
+    [(("words", "one"), "uno"), ((), "everything")],
+]
+
+
+@pytest.mark.parametrize("values", SET_MANY_VALUES)
+@pytest.mark.parametrize("strategy", Strategy.ALL_FOR_SET)
+def test_set_many(config, values, strategy):
+    expected = copy.deepcopy(config)
+    for keys, value in values:
+        expected = safitty.set(expected, *keys, value=value, strategy=strategy)
+
+    original = copy.deepcopy(config)
+    assert safitty.set_many(config, values, strategy=strategy, inplace=False) == expected
+    assert config == original
+
+    updated = safitty.set_many(copy.deepcopy(config), dict(values), strategy=strategy)
+    assert updated == safitty.set_many(copy.deepcopy(config), list(dict(values).items()), strategy=strategy)
+
+
+@pytest.mark.parametrize("strategy", Strategy.ALL_FOR_SET)
+def test_set_many_random(strategy):
+    random = Random(strategy)
+    keys = [0, 1, "a"]
+    values = [None, 0, 1, {}, [], {"a": 1}, [None, 2]]
+
+    for _ in range(1000):
+        storage = random.choice([{}, [], {"a": [None, {"a": 1}]}, [{"a": None}, 1]])
+        writes = [
+            (tuple(random.choice(keys) for _ in range(random.randint(1, 3))), random.choice(values))
+            for _ in range(random.randint(1, 6))
+        ]
+
+        expected = copy.deepcopy(storage)
+        for path, value in writes:
+            expected = safitty.set(expected, *path, value=copy.deepcopy(value), strategy=strategy)
+
+        writes = [(path, copy.deepcopy(value)) for path, value in writes]
+        assert safitty.set_many(storage, writes, strategy=strategy, inplace=False) == expected, writes
+
+
+def test_set_many_wrong_strategy(config):
+    with pytest.raises(ValueError):
+        safitty.set_many(config, [(("a",), 1)], strategy="unknown")
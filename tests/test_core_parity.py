@@ -0,0 +1,101 @@
+"""The compiled ``safitty.core`` must give the same results as its pure Python source"""
+import copy
+import importlib.util
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+import safitty
+from safitty import core
+from safitty.types import Strategy
+
+from tests.test_core import KEYS, SET_MANY_VALUES
+
+
+PURE_CORE = Path(core.__file__).with_name("core.py")
+
+if not core.COMPILED:
+    pytest.skip("safitty.core is not compiled, there is nothing to compare", allow_module_level=True)
+if not PURE_CORE.exists():
+    pytest.skip("the source of safitty.core is not installed", allow_module_level=True)
+
+spec = importlib.util.spec_from_file_location("safitty._pure_core", str(PURE_CORE))
+pure = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(pure)
+
+STORAGES = [
+    None,
+    {"a": 1, 1: "int", "b": None, 2.5: "float"},
+    [10, None, [1, 2]],
+    (10, 20),
+    "text",
+    MappingProxyType({"a": {"b": 1}}),
+]
+
+SINGLE_KEYS = ["a", 1, 0, -1, 5, True, None, 1.5, "b", safitty.star()]
+
+
+def assert_same(name, *args, **kwargs):
+    """Both modules return equal results or raise the same exception"""
+    if name in ["set", "set_many"]:
+        # the storage can be changed in place
+        pure_args, pure_kwargs = copy.deepcopy((args, kwargs))
+        args, kwargs = copy.deepcopy((args, kwargs))
+    else:
+        pure_args, pure_kwargs = args, kwargs
+
+    try:
+        expected = getattr(pure, name)(*pure_args, **pure_kwargs)
+        if name == "find":
+            expected = list(expected)
+    except Exception as error:
+        with pytest.raises(type(error)):
+            result = getattr(core, name)(*args, **kwargs)
+            if name == "find":
+                list(result)
+        return
+
+    result = getattr(core, name)(*args, **kwargs)
+    if name == "find":
+        result = list(result)
+    assert result == expected
+
+
+def test_pure_core_is_loaded():
+    assert not pure.COMPILED
+    assert pure is not core
+
+
+@pytest.mark.parametrize("storage", STORAGES)
+@pytest.mark.parametrize("key", SINGLE_KEYS)
+def test_get_value(storage, key):
+    assert_same("get_value", storage, key)
+    assert_same("get_child", storage, key)
+
+
+@pytest.mark.parametrize("keys", KEYS)
+@pytest.mark.parametrize("strategy", [None] + Strategy.ALL_FOR_GET)
+def test_get(config, keys, strategy):
+    assert_same("get_by_keys", config, *keys)
+    assert_same("get", config, *keys, strategy=strategy, default="default")
+    assert_same("get", config, *keys, default=0, transform=str)
+
+
+@pytest.mark.parametrize("keys", KEYS)
+@pytest.mark.parametrize("strategy", Strategy.ALL_FOR_SET)
+@pytest.mark.parametrize("inplace, copy_on_write", [(True, False), (False, False), (False, True)])
+def test_set(config, keys, strategy, inplace, copy_on_write):
+    params = dict(value={"new": [1]}, strategy=strategy, inplace=inplace, copy_on_write=copy_on_write)
+    assert_same("set", config, *keys, **params)
+
+
+@pytest.mark.parametrize("values", SET_MANY_VALUES)
+@pytest.mark.parametrize("strategy", Strategy.ALL_FOR_SET)
+def test_set_many(config, values, strategy):
+    assert_same("set_many", config, values, strategy=strategy)
+
+
+def test_find(config):
+    star, dstar = safitty.star(), safitty.dstar()
+    for keys in [(dstar,), ("servers", star, "address"), (dstar, 1), ("key", dstar, star)]:
+        assert_same("find", config, *keys)
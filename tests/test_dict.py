@@ -0,0 +1,272 @@
+import copy
+import pickle
+import threading
+import pytest
+from safitty import Safict, Accessor, core
+from safitty.dict import SafictView
+from safitty.types import MISSING
+
+
+PATHS = [
+    ("words", "one"),
+    ("words", "none"),
+    ("words", "none", "deeper"),
+    ("key", "value", 1),
+    ("key", "value", 5),
+    ("servers", "main-server", "address"),
+    ("servers", "other", "address"),
+    ("numbers", 4),
+    ("numbers2", "inner", 0),
+]
+
+
+def assert_same_reads(indexed: Safict, plain: Safict):
+    storage = plain.item()
+    paths = PATHS + [path for path, _ in core.iter_paths(storage)]
+    for keys in paths:
+        for strategy in [None, "missing_key", "last_value"]:
+            params = dict(strategy=strategy, default="default", cast_dict=False)
+            assert indexed.get(*keys, **params) == plain.get(*keys, **params)
+
+
+def test_indexed_get(config):
+    indexed = Safict(copy.deepcopy(config), indexed=True)
+    assert_same_reads(indexed, Safict(config))
+    assert indexed._index is not None
+    assert indexed.get("words", "one", transform=str.upper) == "UNO"
+    assert indexed.get("servers", "main-server", cast_dict=False) == config["servers"]["main-server"]
+
+
+@pytest.mark.parametrize("keys, value", [
+    (("words", "one"), "eins"),
+    (("words", "none", "deeper"), 1),
+    (("key", "value"), {"new": [1, 2]}),
+    (("key", "value", 4), "elem5"),
+    (("servers", "other", "address"), "localhost"),
+    (("servers", "main-server"), None),
+    (("numbers", 7, "deep"), [0]),
+    (("status", "code"), 200),
+    (("new",), {"a": {"b": 1}}),
+])
+def test_indexed_set(config, keys, value):
+    indexed = Safict(copy.deepcopy(config), indexed=True)
+    plain = Safict(copy.deepcopy(config))
+
+    indexed.get("words", "one")
+    index = indexed._index
+    indexed[keys] = value
+    plain[keys] = value
+
+    assert indexed._index is index
+    assert_same_reads(indexed, plain)
+    assert len(index) == len(list(core.iter_paths(plain.item())))
+
+
+def test_indexed_separator(config):
+    indexed = Safict(copy.deepcopy(config), separator=".", indexed=True)
+    assert indexed["servers.main-server.address"] == "localhost:8888"
+    indexed["servers.main-server.address"] = "localhost:9999"
+    assert indexed["servers.main-server.address"] == "localhost:9999"
+
+
+def test_copy_on_write(config):
+    storage = copy.deepcopy(config)
+    parent = Safict(storage, copy_on_write=True)
+
+    child = parent.set("servers", "main-server", "password", value="secret")
+    assert parent["servers", "main-server", "password"] == "qwerty"
+    assert child["servers", "main-server", "password"] == "secret"
+    assert storage == config
+
+    # only the containers on the path are copied
+    assert child.item() is not parent.item()
+    assert child.item()["servers"] is not parent.item()["servers"]
+    assert child.item()["servers"]["broken-server"] is parent.item()["servers"]["broken-server"]
+    assert child.item()["words"] is parent.item()["words"]
+
+    grandchild = child.set("numbers", 6, value=8)
+    assert grandchild["numbers"] == [1, 2, -2, 4, 7, None, 8]
+    assert child["numbers"] == config["numbers"]
+
+    child["words", "one"] = "eins"
+    assert child["words", "one"] == "eins"
+    assert parent["words", "one"] == "uno"
+    assert grandchild["words", "one"] == "uno"
+
+
+def test_copy_on_write_indexed(config):
+    parent = Safict(copy.deepcopy(config), indexed=True, copy_on_write=True)
+    plain = Safict(copy.deepcopy(config))
+    assert parent["words", "one"] == "uno"
+
+    for keys, value in [(("words", "one"), "eins"), (("key", "value", 3), "elem4"), (("a", "b"), 1)]:
+        parent[keys] = value
+        plain[keys] = value
+        assert_same_reads(parent, plain)
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_concurrent(config, indexed):
+    safict = Safict(copy.deepcopy(config), indexed=indexed, concurrent=True, track_changes=True)
+    assert safict.concurrent and safict.copy_on_write
+    assert safict.copy().concurrent and safict["words"].concurrent
+
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                pair = safict.get("pair", "value", cast_dict=False)
+                new = safict.get("new", cast_dict=False) or {}
+                # a half-made version would have the containers of a path without its leaf
+                if pair is not None and pair["left"] != pair["right"] \
+                        or any(value != {"b": {"c": 1}} for value in new.values()):
+                    errors.append((pair, new))
+            except RuntimeError as error:
+                # dictionary changed size during iteration
+                errors.append(error)
+
+    def write(i):
+        for j in range(200):
+            safict["pair", "value"] = {"left": j, "right": j}
+            safict["counter", f"writer{i}", j] = j
+            safict["new", f"writer{i}-{j}", "b", "c"] = 1
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    writers = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert len(safict["new"]) == 4 * 200
+    for i in range(4):
+        assert safict.get("counter", f"writer{i}", cast_dict=False) == list(range(200))
+
+    for other in [pickle.loads(pickle.dumps(safict)), copy.deepcopy(safict)]:
+        assert other.concurrent and other._lock is not safict._lock
+        assert other.to_dict() == safict.to_dict() and other.changes() == safict.changes()
+        other["pair", "value"] = None
+        assert safict.get("pair", "value", cast_dict=False) == {"left": 199, "right": 199}
+    assert not pickle.loads(pickle.dumps(Safict(config))).concurrent
+    assert len(safict.changes()) == 4 * 600
+    assert_same_reads(safict, Safict(safict.to_dict()))
+
+
+def test_track_changes(config):
+    safict = Safict(copy.deepcopy(config), track_changes=True, copy_on_write=True)
+    with pytest.raises(ValueError):
+        Safict(config).changes()
+
+    safict["words", "one"] = "eins"
+    safict["words", "one"] = "ein"
+    safict["words", "five"] = "five"
+    safict.set("words", "two", value="three", strategy="missing_key", inplace=True)
+    safict["status"] = 400
+    safict["servers", "other", "address"] = "localhost"
+
+    assert [change.keys for change in safict.changes()] == [
+        ("words", "one"), ("words", "one"), ("words", "five"), ("status",), ("servers", "other", "address")
+    ]
+    assert safict.changes()[2].old is MISSING
+
+    derived = safict.set("numbers", 1, value=42)
+    assert len(derived.changes()) == len(safict.changes()) + 1
+
+    assert safict.diff() == {
+        ("words", "one"): ("uno", "ein"),
+        ("words", "five"): (MISSING, "five"),
+        ("servers", "other", "address"): (None, "localhost"),
+    }
+
+    safict["words"] = {"one": "uno"}
+    safict["words", "one"] = "un"
+    assert safict.diff()[("words",)][1] == {"one": "un"}
+    assert ("words", "one") not in safict.diff()
+    assert safict.diff()[("words",)][0] == config["words"]
+
+    safict = Safict({"a": {"b": 0, "c": 1}}, track_changes=True)
+    safict["a", "b"] = 5
+    safict["a"] = {"b": 0, "c": 2}
+    assert safict.diff() == {("a",): ({"b": 0, "c": 1}, {"b": 0, "c": 2})}
+
+
+def test_views(config):
+    root = Safict(copy.deepcopy(config), indexed=True)
+    servers = root["servers"]
+    main_server = servers["main-server"]
+    assert isinstance(main_server, SafictView)
+    assert main_server._root is root and main_server._prefix == ("servers", "main-server")
+    assert main_server.item() is root.item()["servers"]["main-server"]
+    assert main_server["address"] == "localhost:8888"
+    assert dict(main_server) == config["servers"]["main-server"]
+    assert len(servers) == 4
+
+    main_server["password"] = "secret"
+    assert root["servers", "main-server", "password"] == "secret"
+    assert main_server["password"] == "secret"
+
+    detached = main_server.set("password", value="other")
+    assert not isinstance(detached, SafictView)
+    assert detached["password"] == "other"
+    assert main_server["password"] == "secret"
+
+    # not the value by the keys: a default or a transformed value
+    assert not isinstance(root.get("missing", default={"a": 1}), SafictView)
+    assert not isinstance(root.get("servers", "main-server", transform=dict), SafictView)
+    assert not isinstance(root.get("words", "one", "two", strategy="last_container"), SafictView)
+
+    root["servers"] = "replaced"
+    assert len(servers) == 0 and list(servers) == [] and dict(main_server) == {}
+    assert main_server.get("address") is None
+
+
+def test_views_copy_on_write(config):
+    root = Safict(copy.deepcopy(config), copy_on_write=True, track_changes=True)
+    words = root["words"]
+    storage = root.item()
+
+    words["one"] = "eins"
+    assert root["words", "one"] == "eins"
+    assert words["one"] == "eins"
+    assert storage["words"]["one"] == "uno"
+    assert words.changes() == root.changes()
+    assert root.diff() == {("words", "one"): ("uno", "eins")}
+
+
+def test_split_keys(config):
+    safict = Safict(copy.deepcopy(config), separator=".")
+    assert safict._split_keys(("servers.main-server.address",)) == ("servers", "main-server", "address")
+    assert safict._split_keys(("key.value", 1)) == ("key", "value", 1)
+    assert safict._split_keys(("words.one",)) is safict._split_keys(("words.one",))
+
+    keys = ("words", "one")
+    assert Safict(config)._split_keys(keys) is keys
+
+
+def test_path(config):
+    safict = Safict(copy.deepcopy(config), separator=".")
+    address = safict.path("servers.main-server.address")
+    assert address.keys == ("servers", "main-server", "address")
+    assert address.get() == address() == "localhost:8888"
+    assert safict.path("servers.other.address").get(default="localhost") == "localhost"
+
+    address.set("localhost:9999", inplace=True)
+    assert safict["servers.main-server.address"] == "localhost:9999"
+    assert isinstance(safict.path("servers", "main-server")(), SafictView)
+
+
+def test_get_many(config):
+    safict = Safict(copy.deepcopy(config), separator=".")
+    servers, one, length, missing = safict.get_many(
+        ["servers", ("words", "one"), Accessor("numbers", transform=len), "numbers.10"],
+        default=0
+    )
+    assert isinstance(servers, SafictView) and servers["main-server.address"] == "localhost:8888"
+    assert (one, length, missing) == ("uno", 5, 0)
+    assert servers.get_many(["main-server.password", "other"]) == ["qwerty", None]
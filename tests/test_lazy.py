@@ -0,0 +1,161 @@
+import copy
+import json
+import mmap
+from collections import OrderedDict
+
+import pytest
+import safitty
+from safitty.lazy import LazyDict, JsonScanner
+
+from .test_parser import EXAMPLES
+
+
+JSON = '''
+{
+    "a": {"x": "} ] { [", "y": [1, {"z": "\\\\\\""}]},
+    "ключ": "значение", "n" : 1.5e3 ,
+    "a": [],
+    "e": {}
+}
+'''
+
+NESTED = {
+    "a": {"x": "} ] { [", "y": [[1, {"z": "]]]"}], {}]},
+    "b": [{"c": [[[]]]}, "{"],
+    "c": 1,
+    "d": {"e": {"f": {"g": [1, 2, "}}}"]}}},
+}
+
+YAML = """---
+# comment
+paths:
+- /data/{a,b}
+- {key: "value: #1"}
+1: one
+"quoted key": |
+  text
+  more text: with colon
+
+url: http://localhost:8080  # comment
+"""
+
+BIG_INTS = '{"a": 123456789012345678901234567890, "b": [18446744073709551616, 1]}'
+
+EAGER = [
+    ("tree.yml", "a: &anchor {b: 1}\nc: *anchor\n"),
+    ("list.json", "[1, 2]"),
+    ("flow.yml", "{a: 1}\n"),
+    ("complex.yml", "? a\n: 1\n"),
+    ("empty.json", ""),
+    ("quoted.yml", 'a: "foo\nbar: baz"\nc: 1\n'),
+    ("nested.yml", "a:\n  b: 'x\nc: y'\nd: 1\n"),
+    ("flow.yml", "a: {x: 1,\nb: 2}\nc: [1,\nd: 2]\n"),
+    ("comment.yml", "a: [1, # ]\nb: 2]\n"),
+]
+
+
+@pytest.mark.parametrize("name, content", [
+    ("config.json", JSON),
+    ("config.yml", YAML),
+    ("null.yml", "null: d\nb: 1\n"),
+    ("big.json", BIG_INTS),
+])
+@pytest.mark.parametrize("ordered", [False, True])
+@pytest.mark.parametrize("backend", ["auto", "python"])
+def test_lazy_load(tmp_path, name, content, ordered, backend):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+
+    loaded = safitty.load(path, ordered=ordered, backend=backend, lazy=True)
+    expected = safitty.load(path, ordered=ordered, backend=backend)
+
+    assert isinstance(loaded, LazyDict)
+    assert not any(loaded.is_loaded(key) for key in loaded)
+    assert list(loaded) == list(expected)
+
+    first = next(iter(loaded))
+    assert loaded[first] == expected[first]
+    assert loaded.is_loaded(first)
+
+    assert loaded.to_dict() == expected
+    assert type(loaded.to_dict()) is type(expected)
+
+
+def test_lazy_load_big_ints(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(BIG_INTS, encoding="utf-8")
+
+    loaded = safitty.load(path, lazy=True)
+    assert isinstance(loaded, LazyDict)
+    assert loaded.to_dict() == json.loads(BIG_INTS)
+    assert type(loaded["a"]) is int
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, JsonScanner.CHUNK_SIZE])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_lazy_json_skipping(tmp_path, monkeypatch, chunk_size, indent):
+    monkeypatch.setattr(JsonScanner, "CHUNK_SIZE", chunk_size)
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(NESTED, indent=indent), encoding="utf-8")
+
+    loaded = safitty.load(path, lazy=True)
+    assert isinstance(loaded, LazyDict)
+    assert loaded.to_dict() == NESTED
+
+
+@pytest.mark.parametrize("name", ["config.yml", "another.yml", "config.json"])
+def test_lazy_load_examples(name):
+    path = EXAMPLES / name
+    assert safitty.load(path, lazy=True) == safitty.load(path)
+
+
+@pytest.mark.parametrize("name, content", EAGER)
+def test_lazy_load_fallback(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+
+    loaded = safitty.load(path, lazy=True)
+    assert not isinstance(loaded, LazyDict)
+    assert loaded == safitty.load(path)
+
+
+def test_lazy_load_binary(tmp_path, monkeypatch):
+    path = tmp_path / "config.sfb"
+    safitty.save({"a": 1}, path)
+
+    # other formats are loaded eagerly without mapping the file
+    mapped = []
+    monkeypatch.setattr(mmap, "mmap", lambda *args, **kwargs: mapped.append(args))
+    assert safitty.load(path, lazy=True) == {"a": 1}
+    assert mapped == []
+
+
+def test_lazy_errors(tmp_path):
+    path = tmp_path / "config.json"
+    for content in ['{"a": 1', '{"a" 1}', '{"a": 1} 2']:
+        path.write_text(content, encoding="utf-8")
+        with pytest.raises(ValueError):
+            safitty.load(path, lazy=True)
+
+
+def test_lazy_safict(tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text(YAML, encoding="utf-8")
+    config = safitty.Safict.load(path, lazy=True)
+    storage = config.get()
+
+    assert config.get("paths", 1, "key") == "value: #1"
+    assert storage.is_loaded("paths") and not storage.is_loaded("url")
+
+    updated = config.set("url", value="localhost")
+    assert updated.get("url") == "localhost"
+    assert config.get("url") == "http://localhost:8080"
+
+    deep = copy.deepcopy(storage)
+    deep["paths"].append(None)
+    assert len(config.get("paths")) == 2
+
+    config.save(tmp_path / "saved.yml")
+    assert safitty.load(tmp_path / "saved.yml") == safitty.load(path)
+    assert config.to_dict() == safitty.load(path)
+    assert type(safitty.Safict.load(path, lazy=True, ordered=True).to_dict()) is OrderedDict
@@ -0,0 +1,324 @@
+import copy
+import gc
+import json
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+import yaml
+import safitty
+from safitty import parser
+
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+CONTENTS = [
+    '{"b": {"y": [1, 2.5, null], "x": "текст"}, "a": true}',
+    '[1, {"nan": NaN, "big": 123456789012345678901234567890}]',
+    '{"b": [18446744073709551616, -9223372036854775809, 1.5], "a": 123456789012345678901234567890}',
+    "",
+]
+
+
+@pytest.mark.parametrize("content", CONTENTS)
+@pytest.mark.parametrize("ordered", [False, True])
+@pytest.mark.parametrize("mmap_threshold", [0, parser.JSON_MMAP_THRESHOLD])
+def test_load_json(tmp_path, monkeypatch, content, ordered, mmap_threshold):
+    monkeypatch.setattr(parser, "JSON_MMAP_THRESHOLD", mmap_threshold)
+    path = tmp_path / "config.json"
+    path.write_text(content, encoding="utf-8")
+
+    loaded = safitty.load(path, ordered=ordered)
+    expected = json.loads(content, object_pairs_hook=OrderedDict if ordered else None) if content else {}
+    assert json.dumps(loaded) == json.dumps(expected)
+    assert loaded == expected
+
+    if ordered and content.startswith("{"):
+        assert isinstance(loaded, OrderedDict)
+        assert list(loaded) == ["b", "a"]
+
+
+def test_load_json_without_orjson(tmp_path, monkeypatch):
+    monkeypatch.setattr(parser, "orjson", None)
+    path = tmp_path / "config.json"
+    path.write_text(CONTENTS[0], encoding="cp1251")
+
+    assert safitty.load(path, encoding="cp1251") == json.loads(CONTENTS[0])
+
+
+def test_load_json_errors(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"a": ', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        safitty.load(path)
+
+
+def test_gc_paused():
+    assert gc.isenabled()
+    with parser.gc_paused():
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+
+@pytest.mark.parametrize("name", ["config.yml", "another.yml", "config.json"])
+@pytest.mark.parametrize("ordered", [False, True])
+def test_load_backends(name, ordered):
+    path = EXAMPLES / name
+    loaded = safitty.load(path, ordered=ordered)
+    assert loaded == safitty.load(path, ordered=ordered, backend="python")
+    if ordered:
+        assert isinstance(loaded, OrderedDict)
+
+    with pytest.raises(ValueError):
+        safitty.load(path, backend="unknown")
+
+
+def test_yaml_loader():
+    assert parser.yaml_loader(backend="python") is yaml.Loader
+    assert parser.yaml_loader(ordered=True, backend="python") is parser.OrderedLoader
+    if parser.CLoader is not None:
+        assert parser.yaml_loader() is yaml.CLoader
+        assert issubclass(parser.yaml_loader(ordered=True), yaml.CLoader)
+
+
+def test_load_from_args_workers(tmp_path):
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"config{i}.yml"
+        path.write_text(f"common: {{value: {i}, list: [{i}]}}\nkey{i}: {i}\n", encoding="utf-8")
+        paths.append(str(path))
+    arguments = ["-C"] + paths + ["--common/value=42:int"]
+
+    _, expected = safitty.load_from_args(arguments=arguments)
+    assert expected["common"] == {"value": 42, "list": [5]}
+    assert len(expected) == 7
+
+    _, config = safitty.load_from_args(arguments=arguments, workers=4)
+    assert config == expected
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        cache = safitty.ParseCache(tmp_path / "cache")
+        _, config = safitty.load_from_args(arguments=arguments, executor=executor, cache=cache, ordered=True)
+    assert config == expected
+    assert len(list((tmp_path / "cache").iterdir())) == 6
+
+
+def update_reference(config, updated_config):
+    result = copy.copy(config)
+    for k, v in updated_config.items():
+        if isinstance(v, Mapping):
+            result[k] = update_reference(result.get(k, {}), v)
+        else:
+            result[k] = v
+    return result
+
+
+UPDATES = [
+    {"a": {"b": 2, "c": {"d": [1]}}, "e": 1},
+    {"a": {"c": {"d": [2, 3], "f": None}}, "g": {"h": {}}},
+    {"m": {"x": 1}, "a": {"n": {"y": 2}}},
+    {"g": {"h": {"i": 1}}, "m": {"x": 2, "z": [4]}, "e": 2},
+]
+
+
+def test_update():
+    base = {"a": {"b": 1, "k": "v"}, "e": 0, "l": [1, 2]}
+    originals = copy.deepcopy([base] + UPDATES)
+
+    expected = base
+    for updated in UPDATES:
+        expected = update_reference(expected, updated)
+    result = safitty.update(base, *UPDATES)
+
+    assert result == expected
+    assert [base] + UPDATES == originals
+    assert result["l"] is base["l"]
+    assert safitty.update(base) == base and safitty.update(base) is not base
+    assert safitty.update(base, {"e": {"x": 1}}, {"e": {"y": 2}})["e"] == {"x": 1, "y": 2}
+
+    ordered = OrderedDict([("b", 1), ("a", OrderedDict([("x", 1)]))])
+    result = safitty.update(ordered, {"a": {"y": 2}, "c": 3})
+    assert type(result) is OrderedDict and type(result["a"]) is OrderedDict
+    assert list(result) == ["b", "a", "c"] and list(result["a"]) == ["x", "y"]
+
+
+def test_update_list_strategies():
+    base = {"layers": [{"name": "conv", "dim": 32}, {"name": "fc", "dim": 10}, 1], "tags": ["a"]}
+    first = {"layers": [{"name": "fc", "dim": 20}, {"name": "norm"}], "tags": ["b"]}
+    second = {"layers": [{"name": "conv", "act": "relu"}, 2], "tags": "c"}
+
+    assert safitty.update(base, first, second)["layers"] == second["layers"]
+    assert safitty.update(base, first, second, list_strategy="append") == {
+        "layers": base["layers"] + first["layers"] + second["layers"],
+        "tags": "c",
+    }
+    assert safitty.update(base, first, second, list_strategy="merge_by_index")["layers"] == [
+        {"name": "conv", "dim": 20, "act": "relu"},
+        2,
+        1,
+    ]
+    assert safitty.update(base, first, second, list_strategy="merge_by_key", list_key="name")["layers"] == [
+        {"name": "conv", "dim": 32, "act": "relu"},
+        {"name": "fc", "dim": 20},
+        1,
+        {"name": "norm"},
+        2,
+    ]
+    assert base["layers"][0] == {"name": "conv", "dim": 32}
+
+    with pytest.raises(ValueError):
+        safitty.update(base, first, list_strategy="merge_by_key")
+    with pytest.raises(ValueError):
+        safitty.update(base, first, list_strategy="unknown")
+
+
+def test_update_deep():
+    depth = sys.getrecursionlimit() * 2
+    first, second = {}, {}
+    node_first, node_second = first, second
+    for i in range(depth):
+        node_first["next"], node_second["next"] = {"first": i}, {"second": i}
+        node_first, node_second = node_first["next"], node_second["next"]
+
+    node = safitty.update(first, second)
+    for i in range(depth):
+        node = node["next"]
+        assert node["first"] == node["second"] == i
+
+
+SAVED = {"a": [1, 2.5, None, True], "b": {"c": "текст", "d": {}, "e": float("nan")}, "f": 1e-7}
+
+
+@pytest.mark.parametrize("name", ["config.json", "config.yml"])
+@pytest.mark.parametrize("backend", ["auto", "python"])
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("streaming", [False, True])
+def test_save(tmp_path, name, backend, compact, streaming):
+    path = tmp_path / name
+    safitty.save(SAVED, path, backend=backend, compact=compact, streaming=streaming)
+
+    loaded = safitty.load(path)
+    assert loaded["b"]["e"] != loaded["b"]["e"]
+    loaded["b"]["e"] = SAVED["b"]["e"]
+    assert loaded == SAVED
+    assert list(tmp_path.iterdir()) == [path]
+
+    if name == "config.json":
+        content = path.read_text(encoding="utf-8")
+        assert ("\n" in content) != compact
+        assert (" " in content.replace("текст", "")) != compact
+
+
+def test_save_atomic(tmp_path):
+    path = tmp_path / "config.json"
+    safitty.save({"a": 1}, path)
+    path.chmod(0o640)
+
+    with pytest.raises(TypeError):
+        safitty.save({"a": object()}, path)
+    assert safitty.load(path) == {"a": 1}
+    assert list(tmp_path.iterdir()) == [path]
+
+    safitty.save({"a": 2}, path, data_format="json")
+    assert safitty.load(path) == {"a": 2}
+    assert path.stat().st_mode & 0o777 == 0o640
+
+    with pytest.raises(TypeError):
+        safitty.save({"a": object()}, path, atomic=False)
+    assert path.read_text() == ""
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("True:bool", True),
+    ("True:str", "True"),
+    ("True", "True"),
+    ("'True:bool'", "True:bool"),
+    ("1:int", 1),
+    ("1:float", 1.0),
+    ("value:not.a.type", "value"),
+    ("[1,2]:list", [1, 2]),
+    ("'[1,2]:list'", "[1,2]:list"),
+    ("(1, 'a'):set", {1, "a"}),
+    ("[1]:frozenset", frozenset([1])),
+    ("{'a': [1, {'b': None}]}:dict", {"a": [1, {"b": None}]}),
+    ("a=1, b='c':dict", {"a": 1, "b": "c"}),
+    ("'ab':list", ["a", "b"]),
+    ("range(3):list", "range(3)"),
+    ("1), print(2:list", "1), print(2"),
+    ("x)(1:list", "x)(1"),
+    ("**{'a': 1}:dict", "**{'a': 1}"),
+    ("__import__('os'):list", "__import__('os')"),
+])
+def test_parse_content(value, expected):
+    result = parser.parse_content(value)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+def test_type_from_str(monkeypatch):
+    monkeypatch.setattr(parser, "TYPE_REGISTRY", {"int": int})
+    assert parser.type_from_str("collections.OrderedDict") is OrderedDict
+
+    calls = []
+    monkeypatch.setattr(parser, "locate", lambda dtype: calls.append(dtype))
+    assert parser.type_from_str("collections.OrderedDict") is OrderedDict
+    assert parser.type_from_str("int") is int
+    assert parser.type_from_str("not.a.type") is None
+    assert parser.type_from_str("not.a.type") is None
+    assert calls == ["not.a.type"]
+
+
+def test_parse_overrides(monkeypatch):
+    calls = []
+    parse_content = parser.parse_content
+    monkeypatch.setattr(parser, "parse_content", lambda value: calls.append(value) or parse_content(value))
+
+    overrides = parser.parse_overrides([
+        "--stages/train/lr=0.1:float",
+        "--stages/train/epochs=10:int",
+        "--stages/valid/epochs=10:int",
+        "--/stages/train/lr/=0.01:float",
+        "--data/0:int/shape=[3, 224]:list",
+        "--data/1:int/shape=[3, 224]:list",
+        "--model=a=1:dict",
+    ])
+    assert overrides == [
+        (("stages", "train", "lr"), 0.1),
+        (("stages", "train", "epochs"), 10),
+        (("stages", "valid", "epochs"), 10),
+        (("stages", "train", "lr"), 0.01),
+        (("data", 0, "shape"), [3, 224]),
+        (("data", 1, "shape"), [3, 224]),
+        (("model", ), {"a": 1}),
+    ]
+    assert overrides[4][1] is not overrides[5][1]
+    assert overrides[4][0][1] == 0 and overrides[5][0][1] == 1
+    assert sorted(calls) == sorted([
+        "0.1:float", "10:int", "0.01:float", "[3, 224]:list", "[3, 224]:list", "a=1:dict",
+        "stages", "train", "epochs", "valid", "lr", "data", "0:int", "shape", "1:int", "model",
+    ])
+
+
+def test_update_from_args():
+    config = {"stages": {"train": {"lr": 0.1, "epochs": 1}}, "data": [{"shape": None}]}
+    updated = safitty.update_from_args(config, [
+        "--stages/train/lr=0.01:float",
+        "--stages/valid/epochs=2:int",
+        "--data/0:int/shape=[3, 224]:list",
+        "--stages/train/lr=0.001:float",
+    ])
+    assert updated == {
+        "stages": {"train": {"lr": 0.001, "epochs": 1}, "valid": {"epochs": 2}},
+        "data": [{"shape": [3, 224]}],
+    }
+    assert config == {"stages": {"train": {"lr": 0.1, "epochs": 1}}, "data": [{"shape": None}]}
+
+    updated = safitty.update_from_args(OrderedDict(), ["--x=1:int", "--y=2:int", "--x=3:int"])
+    assert list(updated.items()) == [("x", 3), ("y", 2)]
+
+    with pytest.raises(ValueError):
+        safitty.update_from_args({}, ["--verbose"])
@@ -0,0 +1,140 @@
+import copy
+import pickle
+import subprocess
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import safitty
+from safitty import binary
+from safitty.shared import SharedConfig, SharedDict, shared_memory
+
+
+CONFIG = OrderedDict([
+    ("model", {"name": "resnet", "layers": [{"dim": 64}, {"dim": 128}, [1, {"deep": True}]], "bias": None}),
+    ("stages", OrderedDict([("train", {"lr": 1e-3, "epochs": 10}), ("valid", {})])),
+    ("labels", {0: "cat", 1: "dog"}),
+    ("shape", (3, 224, 224)),
+    ("tags", {"a", "b"}),
+])
+
+
+def read_in_worker(storage):
+    return storage["model"]["layers"][1]["dim"], type(storage).__name__
+
+
+@pytest.fixture(params=["memory", "file"])
+def shared(request, tmp_path):
+    if request.param == "memory":
+        if shared_memory is None:
+            pytest.skip("multiprocessing.shared_memory requires Python 3.8+")
+        config = SharedConfig.create(CONFIG)
+        yield config
+        config.close()
+        config.unlink()
+    else:
+        path = tmp_path / "config.sfb"
+        safitty.save(CONFIG, path)
+        with SharedConfig.open(path) as config:
+            yield config
+
+
+def test_views(shared):
+    storage = shared.storage
+    assert type(storage) is SharedDict
+    assert storage == CONFIG
+    assert list(storage) == list(CONFIG)
+    assert shared.to_dict() == CONFIG
+    assert type(shared.to_dict()) is OrderedDict
+
+    model = storage["model"]
+    assert model is storage["model"]
+    assert type(model["layers"]) is list
+    assert type(model["layers"][0]) is SharedDict
+    assert model["layers"] is not storage["model"]["layers"]
+    assert model["layers"][2][1]["deep"] is True
+    assert "bias" in model and "missing" not in model
+    assert model["bias"] is None
+    assert storage["shape"] == (3, 224, 224) and storage["tags"] == {"a", "b"}
+    assert storage["labels"][1] == "dog"
+    assert storage["stages"]["valid"] == {}
+
+    assert storage.ordered and storage["stages"].ordered and not model.ordered
+    shallow = copy.copy(storage)
+    assert type(shallow) is OrderedDict and shallow["model"] is model
+    deep = copy.deepcopy(storage)
+    assert deep == CONFIG and type(deep["model"]) is dict
+    with pytest.raises(TypeError):
+        storage["model"] = {}
+
+
+def test_safict(shared):
+    safict = shared.safict()
+    assert safict["model", "layers", 1, "dim"] == 128
+    assert safict.get("stages", "train", "momentum", default=0.9) == 0.9
+    assert safict.get("model", "layers", 5, "dim", strategy="last_container") == model_layers(shared)
+    assert [path for path, _ in safict.find("model", "layers", safitty.star(), "dim")] == [
+        ("model", "layers", 0, "dim"), ("model", "layers", 1, "dim"),
+    ]
+    assert safict.to_dict() == CONFIG
+
+    writable = shared.safict(copy_on_write=True)
+    writable["stages", "train", "lr"] = 0.1
+    assert writable["stages", "train", "lr"] == 0.1
+    assert shared.storage["stages"]["train"]["lr"] == 1e-3
+
+
+def model_layers(shared):
+    return shared.storage["model"]["layers"]
+
+
+def test_pickle(shared):
+    state = pickle.dumps(shared.storage["model"])
+    assert len(state) < 200
+
+    model = pickle.loads(state)
+    assert type(model) is SharedDict
+    assert model == CONFIG["model"]
+    model._config.close()
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert list(executor.map(read_in_worker, [shared.storage, shared.storage])) == [(128, "SharedDict")] * 2
+
+
+def test_attach_from_processes():
+    if shared_memory is None:
+        pytest.skip("multiprocessing.shared_memory requires Python 3.8+")
+
+    script = (
+        "import sys\n"
+        "from safitty.shared import SharedConfig\n"
+        "with SharedConfig.attach(sys.argv[1]) as config:\n"
+        "    print(config.storage['model']['layers'][1]['dim'])\n"
+    )
+    root = Path(safitty.__file__).parent.parent
+    with SharedConfig.create(CONFIG) as config:
+        try:
+            # the segment outlives the independent processes that attached to it
+            for _ in range(2):
+                result = subprocess.run(
+                    [sys.executable, "-c", script, config.name],
+                    cwd=str(root), stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+                )
+                assert result.stdout.decode().strip() == "128"
+                assert b"leaked" not in result.stderr
+            assert config.storage["model"]["layers"][1]["dim"] == 128
+        finally:
+            config.unlink()
+
+
+def test_sized_format():
+    sized = binary.dumps(CONFIG, sized=True)
+    assert len(sized) > len(binary.dumps(CONFIG))
+    assert binary.loads(sized) == CONFIG
+
+    decoder = binary.Decoder(sized)
+    decoder.skip()
+    assert decoder.position == len(sized)